@@ -0,0 +1,125 @@
+# benchmark_prompt_encodings.py
+
+import argparse
+import json
+import random
+import re
+
+from gomoku_ai_player import GOMOKU_SYSTEM_PROMPT, PROMPT_ENCODINGS, build_move_prompt
+from gomoku_board import GomokuBoard
+from gomoku_engine import GomokuEngine, self_play_game
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+def make_token_counter(model_name):
+    """Returns a function counting tokens, exact with tiktoken, approximate without."""
+    if tiktoken is None:
+        print("tiktoken not installed; estimating tokens as characters / 4.")
+        return lambda text: max(1, len(text) // 4)
+    try:
+        encoding = tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode(text))
+
+
+def load_positions(path):
+    """Reads a JSONL corpus with one {"board": rows, "player": 1 or 2} object per line."""
+    positions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                positions.append((GomokuBoard.from_rows(record["board"]), record["player"]))
+    return positions
+
+
+def self_play_positions(games, seed):
+    """Builds a corpus from every position of short local engine self-play games."""
+    rng = random.Random(seed)
+    engine = GomokuEngine(max_depth=2)
+    positions = []
+    for _ in range(games):
+        moves, _, _ = self_play_game(engine, rng)
+        board = GomokuBoard()
+        player = 1
+        for row, col in moves:
+            positions.append((board.copy(), player))
+            board.place(row, col, player)
+            player = 3 - player
+    return positions
+
+
+def measure_legal_rate(positions, model_name, samples, seed):
+    """Asks the model for one move per sampled position and encoding; returns legal rates."""
+    import gomoku_ai_player
+
+    if not gomoku_ai_player.client and not gomoku_ai_player.initialize_client_manually():
+        return {}
+    chosen = random.Random(seed).sample(positions, min(samples, len(positions)))
+    rates = {}
+    for encoding in PROMPT_ENCODINGS:
+        legal = 0
+        for board, player in chosen:
+            try:
+                completion = gomoku_ai_player.client.chat.completions.create(
+                    model=model_name,
+                    messages=[
+                        {"role": "system", "content": GOMOKU_SYSTEM_PROMPT},
+                        {"role": "user", "content": build_move_prompt(board, player, 0, encoding)}
+                    ],
+                    temperature=0.2,
+                    max_tokens=15,
+                )
+                response_text = completion.choices[0].message.content.strip()
+            except Exception as e:
+                print(f"An error occurred while calling the OpenAI API: {e}")
+                continue
+            match = re.search(r'\(?(\d{1,2}),\s*(\d{1,2})\)?', response_text)
+            if match:
+                row, col = map(int, match.groups())
+                if board.in_bounds(row, col) and board.is_empty(row, col):
+                    legal += 1
+        rates[encoding] = legal / len(chosen) if chosen else 0
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare prompt tokens per move for each board encoding.")
+    parser.add_argument("--positions", help="JSONL corpus of stored positions (default: engine self-play)")
+    parser.add_argument("--games", type=int, default=20, help="Self-play games when no corpus is given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model", default="gpt-4o", help="Model whose tokenizer is used")
+    parser.add_argument("--live-samples", type=int, default=0,
+                        help="Also ask the model this many moves per encoding to measure the legal-move rate")
+    args = parser.parse_args()
+
+    positions = load_positions(args.positions) if args.positions else self_play_positions(args.games, args.seed)
+    count_tokens = make_token_counter(args.model)
+    system_tokens = count_tokens(GOMOKU_SYSTEM_PROMPT)
+
+    print(f"Positions: {len(positions)}")
+    print(f"{'encoding':<10}{'avg tokens':>12}{'max tokens':>12}{'retry avg':>12}")
+    averages = {}
+    for encoding in PROMPT_ENCODINGS:
+        first = [system_tokens + count_tokens(build_move_prompt(b, p, 0, encoding)) for b, p in positions]
+        retry = [system_tokens + count_tokens(build_move_prompt(b, p, 1, encoding)) for b, p in positions]
+        averages[encoding] = sum(first) / len(first)
+        print(f"{encoding:<10}{averages[encoding]:>12.1f}{max(first):>12}{sum(retry) / len(retry):>12.1f}")
+
+    baseline = averages["grid"]
+    for encoding in PROMPT_ENCODINGS:
+        print(f"  {encoding}: {averages[encoding] / baseline * 100:.1f}% of grid")
+
+    if args.live_samples:
+        rates = measure_legal_rate(positions, args.model, args.live_samples, args.seed)
+        for encoding, rate in rates.items():
+            print(f"  {encoding}: legal first-attempt move rate {rate * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
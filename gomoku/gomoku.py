@@ -1,19 +1,27 @@
 # gomoku.py
 
 import time
-from gomoku_ai_player import get_ai_move, initialize_client_manually
+from gomoku_ai_player import get_ai_move, initialize_client_manually, print_latency_summary
+from gomoku_board import GomokuBoard
+from gomoku_engine import ENGINE_MODEL
+from gomoku_tactics import print_override_summary
+from gomoku_records import GameRecordWriter
 
 # --- Game Constants ---
-BOARD_SIZE = 15
+BOARD_SIZE = 15  # e.g. 19 for a 19x19 board
+WIN_LENGTH = 5   # e.g. 6 for a Connect-6 style game
 MAX_MOVES_PER_PLAYER = 100
+STREAM_REPLIES = True  # Stream model replies and stop reading at the first coordinate pair
 
 # --- Game State ---
-board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+board = GomokuBoard(BOARD_SIZE, WIN_LENGTH)
+# Use ENGINE_MODEL for either player to play the local alpha-beta engine.
 PLAYER_MODELS = {
     1: "gpt-4o-mini",
     2: "gpt-4o"
 }
 player_move_counts = {1: 0, 2: 0}
+move_history = []
 
 def print_board(current_player):
     """Prints the Gomoku board to the console."""
@@ -28,7 +36,7 @@ def print_board(current_player):
     print("   " + " ".join(f"{i:<2}" for i in range(BOARD_SIZE)))
     print("  +" + "---" * BOARD_SIZE + "+")
 
-    for i, row in enumerate(board):
+    for i, row in enumerate(board.rows()):
         print(f"{i:<2}|", end=" ")
         for cell in row:
             if cell == 0:
@@ -42,66 +50,72 @@ def print_board(current_player):
     print("  +" + "---" * BOARD_SIZE + "+")
 
 def check_win(player, row, col):
-    """Checks if the current player has won."""
-    directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-    for dr, dc in directions:
-        count = 1
-        for i in range(1, 5):
-            r, c = row + dr * i, col + dc * i
-            if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-                count += 1
-            else:
-                break
-        for i in range(1, 5):
-            r, c = row - dr * i, col - dc * i
-            if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-                count += 1
-            else:
-                break
-        if count >= 5:
-            return True
-    return False
+    """Checks if the current player has WIN_LENGTH in a row through (row, col)."""
+    return board.check_win(player, row, col)
 
 if __name__ == "__main__":
     print("--- Gomoku AI Battle ---")
     print(f"Player 1: {PLAYER_MODELS[1]} (X)")
     print(f"Player 2: {PLAYER_MODELS[2]} (O)")
+    print(f"Board: {BOARD_SIZE}x{BOARD_SIZE}, {WIN_LENGTH} in a row wins.")
     print(f"Move Limit: {MAX_MOVES_PER_PLAYER} moves per player.")
     print("--------------------------")
 
-    if not initialize_client_manually():
+    needs_client = any(model != ENGINE_MODEL for model in PLAYER_MODELS.values())
+    if needs_client and not initialize_client_manually():
         print("Could not start the game due to API key issue.")
         exit()
 
     current_player = 1
     game_over = False
+    winner, result = None, None
+    started_at = time.time()
     
     while not game_over:
         print_board(current_player)
         model_name = PLAYER_MODELS[current_player]
-        move = get_ai_move(board, current_player, model_name)
+        move = get_ai_move(board, current_player, model_name, stream=STREAM_REPLIES)
 
         if move:
             row, col = move
-            board[row][col] = current_player
+            board.place(row, col, current_player)
             player_move_counts[current_player] += 1
+            move_history.append((row, col))
             
             if check_win(current_player, row, col):
                 print_board(current_player)
                 player_name = PLAYER_MODELS[current_player]
                 print(f"\n*** Player {current_player} ({player_name}) wins! ***\n")
                 game_over = True
+                winner, result = current_player, "five"
             elif player_move_counts[current_player] >= MAX_MOVES_PER_PLAYER:
                 print_board(current_player)
                 print(f"\n*** Draw! Player {current_player} reached the move limit of {MAX_MOVES_PER_PLAYER}. ***\n")
                 game_over = True
-            elif sum(player_move_counts.values()) == BOARD_SIZE * BOARD_SIZE:
+                result = "move_limit"
+            elif board.is_full():
                 print_board(current_player)
                 print("\n*** It's a draw! The board is full. ***\n")
                 game_over = True
+                result = "board_full"
             else:
                 current_player = 2 if current_player == 1 else 1
                 time.sleep(1)
         else:
             print("Error: Failed to get a valid move from the AI after multiple attempts. Ending game.")
-            game_over = True
\ No newline at end of file
+            game_over = True
+            winner, result = 2 if current_player == 1 else 1, "no_move"
+
+    GameRecordWriter().append({
+        "player_1": PLAYER_MODELS[1],
+        "player_2": PLAYER_MODELS[2],
+        "winner": winner,
+        "result": result,
+        "moves": move_history,
+        "board_size": BOARD_SIZE,
+        "win_length": WIN_LENGTH,
+        "started_at": started_at,
+        "duration": time.time() - started_at,
+    })
+    print_override_summary()
+    print_latency_summary()
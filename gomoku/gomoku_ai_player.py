@@ -1,8 +1,14 @@
 import os
 import re
+import time
 import getpass
 from openai import OpenAI
 from dotenv import load_dotenv
+from gomoku_engine import ENGINE_MODEL, get_engine_move
+from gomoku_tactics import find_forced_move, record_move
+from gomoku_cache import MoveCache
+from gomoku_patterns import TOP_CANDIDATES, ranked_candidates
+from gomoku_book import BOOK_PLIES, OpeningBook
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,6 +26,130 @@ if api_key:
 else:
     print("OPENAI_API_KEY environment variable not found.")
 
+# --- Move Cache and Opening Book ---
+move_cache = MoveCache()
+opening_book = OpeningBook()  # Empty until built with gomoku_book.py
+
+# --- Prompt Encodings ---
+# "grid":   full board with legend and some available positions (original format)
+# "rle":    run-length encoded rows, e.g. "7.X.O5."
+# "coords": only the coordinate lists of each player's stones
+PROMPT_ENCODINGS = ("grid", "rle", "coords")
+DEFAULT_ENCODING = "grid"
+
+GOMOKU_SYSTEM_PROMPT = "You are a helpful but strict Gomoku assistant."
+
+# Boards larger than this are shown cropped to the stones plus a margin.
+MAX_RENDER_SIZE = 15
+CROP_MARGIN = 2
+
+def build_move_prompt(board, player, attempt=0, encoding=DEFAULT_ENCODING, num_candidates=1):
+    """
+    Builds the user prompt for one move attempt in the given board encoding.
+    With num_candidates > 1 the first attempt asks for a ranked list of moves.
+    """
+    if encoding not in PROMPT_ENCODINGS:
+        raise ValueError(f"Unknown prompt encoding '{encoding}'. Choose from {PROMPT_ENCODINGS}.")
+
+    player_symbol = "X" if player == 1 else "O"
+    opponent_symbol = "O" if player == 1 else "X"
+    if encoding == "coords":
+        empty_rule = "a position that is not listed as occupied"
+        position_rule = "not listed as occupied"
+    else:
+        empty_rule = "an empty position marked with '.'"
+        position_rule = "empty (marked with '.')"
+
+    n, last = board.size, board.size - 1
+    if board.win_length == 5:
+        game_name = "Gomoku (Five-in-a-Row)"
+    else:
+        game_name = f"{board.win_length}-in-a-Row (a Gomoku variant where {board.win_length} in a row wins)"
+
+    if attempt == 0 and num_candidates > 1:
+        reply_format = "a list of coordinates, each in the format 'row,col',"
+        position_rule_prefix = "every position is"
+    else:
+        reply_format = "the coordinates in the format 'row,col'"
+        position_rule_prefix = "the position is"
+
+    base_prompt = (
+        f"You are an expert {game_name} player. You are Player {player} playing as '{player_symbol}'.\n"
+        f"Your opponent is playing as '{opponent_symbol}'.\n"
+        f"The board is a {n}x{n} grid with coordinates from (0,0) to ({last},{last}).\n"
+        f"You MUST choose {empty_rule} to place your '{player_symbol}' piece.\n\n"
+        "Current board state:\n"
+        f"{board_to_string(board, encoding)}\n"
+        f"IMPORTANT: You must respond with ONLY {reply_format} where {position_rule_prefix} {position_rule}.\n"
+    )
+
+    if attempt == 0 and num_candidates > 1:
+        instruction = f"List your {num_candidates} best moves, best first, as 'row,col' pairs separated by semicolons (e.g., '7,8; 6,7; 8,9'). Respond with ONLY the list."
+    elif attempt == 0:
+        instruction = "Choose your best move. Respond with ONLY 'row,col' coordinates (e.g., '7,8')."
+    elif attempt == 1 and encoding != "coords":
+        # Show which positions are already taken
+        taken_positions = []
+        for i, j in board.occupied_cells():
+            piece = "X" if board.get(i, j) == 1 else "O"
+            taken_positions.append(f"({i},{j})={piece}")
+
+        instruction = f"INVALID MOVE! You selected an occupied position. Here are all occupied positions: {', '.join(taken_positions)}. Look at the board again and choose ONLY coordinates marked with '.' (dot). Respond ONLY with 'row,col'."
+    elif attempt == 1:
+        instruction = "INVALID MOVE! You selected an occupied position. Choose ONLY coordinates that are not listed above. Respond ONLY with 'row,col'."
+    else:
+        on_board = " on the board" if encoding != "coords" else ""
+        instruction = f"FINAL ATTEMPT! You must choose {empty_rule}{on_board}. Any invalid move will result in forfeit. Respond ONLY with 'row,col' coordinates."
+
+    return base_prompt + instruction
+
+def _silent(*args, **kwargs):
+    pass
+
+# Matches a coordinate pair only once the digit after the comma is complete.
+COMPLETE_MOVE_PATTERN = re.compile(r'\(?(\d{1,2}),\s*(\d{1,2})(?=\D)')
+
+# model name -> list of (time to first token, time to answer) in seconds, for streamed requests
+latency_stats = {}
+
+def stream_completion(model_name, messages, is_complete, **options):
+    """
+    Streams a chat completion and stops reading as soon as is_complete(text)
+    is true for the text received so far; the stream is then closed so the
+    rest of a chatty reply is never waited for. Time to first token and time
+    to answer are recorded in latency_stats.
+
+    Returns:
+        str: the (possibly partial) reply text.
+    """
+    start = time.perf_counter()
+    first_token = None
+    text = ""
+    stream = client.chat.completions.create(model=model_name, messages=messages, stream=True, **options)
+    try:
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            text += delta
+            if is_complete(text):
+                break
+    finally:
+        stream.close()
+    answer = time.perf_counter() - start
+    latency_stats.setdefault(model_name, []).append((first_token if first_token is not None else answer, answer))
+    return text.strip()
+
+def print_latency_summary():
+    """Prints the mean time to first token and time to answer of streamed requests per model."""
+    for model_name, samples in latency_stats.items():
+        first_token = sum(sample[0] for sample in samples) / len(samples)
+        answer = sum(sample[1] for sample in samples) / len(samples)
+        print(f"Streaming latency for {model_name}: {len(samples)} requests, "
+              f"time to first token {first_token:.2f}s, time to answer {answer:.2f}s")
+
 def initialize_client_manually():
     global client
     if not client:
@@ -32,81 +162,156 @@ def initialize_client_manually():
             client = None
     return client is not None
 
-def get_ai_move(board, player, model_name):
-    if not client:
-        print("OpenAI client is not initialized.")
-        if not initialize_client_manually():
-            return None
+def get_ranked_candidate_move(board, player, model_name, num_candidates, encoding=DEFAULT_ENCODING, verbose=True,
+                              stream=False):
+    """
+    Asks for several ranked moves in a single call and returns the first legal
+    one, or None if the reply holds no legal candidate. With stream, reading
+    stops at the first complete legal candidate.
+    """
+    log = print if verbose else _silent
+    prompt = build_move_prompt(board, player, 0, encoding, num_candidates)
+    messages = [
+        {"role": "system", "content": GOMOKU_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
 
-    player_symbol = "X" if player == 1 else "O"
-    opponent_symbol = "O" if player == 1 else "X" 
-    base_prompt = (
-        f"You are an expert Gomoku (Five-in-a-Row) player. You are Player {player} playing as '{player_symbol}'.\n"
-        f"Your opponent is playing as '{opponent_symbol}'.\n"
-        "The board is a 15x15 grid with coordinates from (0,0) to (14,14).\n"
-        f"You MUST choose an empty position marked with '.' to place your '{player_symbol}' piece.\n\n"
-        "Current board state:\n"
-        f"{board_to_string(board)}\n"
-        "IMPORTANT: You must respond with ONLY the coordinates in the format 'row,col' where the position is empty (marked with '.').\n"
-    )
+    def has_legal_candidate(text):
+        return any(board.in_bounds(int(row), int(col)) and board.is_empty(int(row), int(col))
+                   for row, col in COMPLETE_MOVE_PATTERN.findall(text))
 
-    for attempt in range(3): # Retry up to 3 times
-        if attempt == 0:
-            instruction = "Choose your best move. Respond with ONLY 'row,col' coordinates (e.g., '7,8')."
-        elif attempt == 1:
-            # Show which positions are already taken
-            taken_positions = []
-            for i in range(15):
-                for j in range(15):
-                    if board[i][j] != 0:
-                        piece = "X" if board[i][j] == 1 else "O"
-                        taken_positions.append(f"({i},{j})={piece}")
-            
-            instruction = f"INVALID MOVE! You selected an occupied position. Here are all occupied positions: {', '.join(taken_positions)}. Look at the board again and choose ONLY coordinates marked with '.' (dot). Respond ONLY with 'row,col'."
+    try:
+        log(f"\nAsking {model_name} for its {num_candidates} best moves...")
+        if stream:
+            response_text = stream_completion(model_name, messages, has_legal_candidate,
+                                              temperature=0.2, max_tokens=8 * num_candidates)
         else:
-            instruction = "FINAL ATTEMPT! You must choose an empty position marked with '.' on the board. Any invalid move will result in forfeit. Respond ONLY with 'row,col' coordinates."
-
-        prompt = base_prompt + instruction
-
-        try:
-            print(f"\nAsking {model_name} for its move (Attempt {attempt + 1})...")
             completion = client.chat.completions.create(
                 model=model_name,
-                messages=[
-                    {"role": "system", "content": "You are a helpful but strict Gomoku assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2 + (attempt * 0.2), # Increase creativity slightly on retries
-                max_tokens=15,
+                messages=messages,
+                temperature=0.2,
+                max_tokens=8 * num_candidates,
             )
-            
             response_text = completion.choices[0].message.content.strip()
-            print(f"{model_name} responded: '{response_text}'")
+        log(f"{model_name} responded: '{response_text}'")
+    except Exception as e:
+        log(f"An error occurred while calling the OpenAI API: {e}")
+        return None
+
+    for rank, (row, col) in enumerate(re.findall(r'\(?(\d{1,2}),\s*(\d{1,2})\)?', response_text), 1):
+        row, col = int(row), int(col)
+        if board.in_bounds(row, col) and board.is_empty(row, col):
+            log(f"✓ Valid move at ({row},{col}) (candidate {rank})")
+            return row, col
+        log(f"✗ Candidate {rank} ({row},{col}) is not playable.")
+    return None
+
+def get_ai_move(board, player, model_name, fallback_to_engine=True, use_tactics=True, use_cache=True,
+                encoding=DEFAULT_ENCODING, num_candidates=1, verbose=True, use_book=True, stream=False):
+    """
+    Returns the (row, col) chosen by the model, or None if no valid move was found.
+    ENGINE_MODEL plays the local engine directly; with fallback_to_engine the
+    local engine also answers when the LLM fails. With use_tactics, forced wins
+    and blocks are played locally without calling the API. With use_cache,
+    earlier answers of the same model for the same (or a symmetric) position
+    are reused. encoding selects the board format sent to the model (see
+    PROMPT_ENCODINGS). With num_candidates > 1 the model is first asked for
+    that many ranked moves in one call; the sequential retries only run if
+    none of them is legal. verbose=False suppresses all console output, for
+    background callers. With use_book, the first BOOK_PLIES plies are played
+    from the opening book when it knows the position. With stream, replies
+    are streamed and reading stops at the first complete coordinate pair;
+    latencies are collected in latency_stats.
+    """
+    log = print if verbose else _silent
+    if model_name == ENGINE_MODEL:
+        return get_engine_move(board, player, verbose)
+
+    if use_tactics:
+        forced = find_forced_move(board, player)
+        record_move(forced)
+        if forced:
+            (row, col), reason = forced
+            log(f"Tactical override ({reason}): playing ({row},{col}) without asking {model_name}.")
+            return row, col
+
+    if use_book and board.move_count < BOOK_PLIES:
+        book_move = opening_book.lookup(board, player)
+        if book_move and board.is_empty(*book_move):
+            log(f"Book move: ({book_move[0]},{book_move[1]})")
+            return book_move
+
+    if use_cache:
+        cached = move_cache.lookup(model_name, player, board)
+        if cached and board.is_empty(*cached):
+            log(f"Cache hit: {model_name} previously played ({cached[0]},{cached[1]}) here.")
+            return cached
+
+    if not client:
+        log("OpenAI client is not initialized.")
+        if not initialize_client_manually():
+            return get_engine_move(board, player, verbose) if fallback_to_engine else None
+
+    if num_candidates > 1:
+        move = get_ranked_candidate_move(board, player, model_name, num_candidates, encoding, verbose, stream)
+        if move:
+            if use_cache:
+                move_cache.store(model_name, player, board, move)
+            return move
+        log("No legal move among the candidates. Falling back to single-move attempts.")
+
+    for attempt in range(3): # Retry up to 3 times
+        prompt = build_move_prompt(board, player, attempt, encoding)
+
+        try:
+            log(f"\nAsking {model_name} for its move (Attempt {attempt + 1})...")
+            messages = [
+                {"role": "system", "content": GOMOKU_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+            temperature = 0.2 + (attempt * 0.2) # Increase creativity slightly on retries
+            if stream:
+                response_text = stream_completion(model_name, messages, COMPLETE_MOVE_PATTERN.search,
+                                                  temperature=temperature, max_tokens=15)
+            else:
+                completion = client.chat.completions.create(
+                    model=model_name,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=15,
+                )
+                response_text = completion.choices[0].message.content.strip()
+            log(f"{model_name} responded: '{response_text}'")
 
             # Updated regex to handle both "X,Y" and "(X, Y)" formats
             match = re.search(r'\(?(\d{1,2}),\s*(\d{1,2})\)?', response_text)
             
             if match:
                 row, col = map(int, match.groups())
-                if 0 <= row < 15 and 0 <= col < 15:
+                if board.in_bounds(row, col):
                     # Final check to ensure the spot is actually empty
-                    if board[row][col] == 0:
-                        print(f"✓ Valid move at ({row},{col})")
+                    if board.is_empty(row, col):
+                        log(f"✓ Valid move at ({row},{col})")
+                        if use_cache:
+                            move_cache.store(model_name, player, board, (row, col))
                         return row, col
                     else:
-                        occupied_by = "X" if board[row][col] == 1 else "O"
-                        print(f"✗ Position ({row},{col}) is occupied by {occupied_by}. Current board[{row}][{col}] = {board[row][col]}")
+                        occupied_by = "X" if board.get(row, col) == 1 else "O"
+                        log(f"✗ Position ({row},{col}) is occupied by {occupied_by}. Current board[{row}][{col}] = {board.get(row, col)}")
                         continue # Move to the next attempt
                 else:
-                    print(f"✗ Coordinates ({row},{col}) are out of bounds (0-14). Retrying...")
+                    log(f"✗ Coordinates ({row},{col}) are out of bounds (0-{board.size - 1}). Retrying...")
             else:
-                print(f"✗ Could not parse coordinates from response: '{response_text}'. Expected format: 'row,col'")
+                log(f"✗ Could not parse coordinates from response: '{response_text}'. Expected format: 'row,col'")
 
         except Exception as e:
-            print(f"An error occurred while calling the OpenAI API: {e}")
+            log(f"An error occurred while calling the OpenAI API: {e}")
             # We will retry on API errors as well
     
-    print("AI failed to provide a valid move after 3 attempts.")
+    log("AI failed to provide a valid move after 3 attempts.")
+    if fallback_to_engine:
+        log("Falling back to the local engine.")
+        return get_engine_move(board, player, verbose)
     return None
 
 def get_ai_action(game_state, player, model_name):
@@ -162,18 +367,29 @@ def get_ai_action(game_state, player, model_name):
     print("AI failed to provide a valid action after 3 attempts.")
     return "Action: skip"
 
-def board_to_string(board):
+def board_to_string(board, encoding=DEFAULT_ENCODING):
     """
-    Converts the board to a clear, readable string format for the AI.
-    Shows row/column indices and uses visual symbols.
+    Converts the board to a string for the AI.
+    "grid" shows row/column indices and uses visual symbols; "rle" and
+    "coords" are compact variants that use far fewer prompt tokens.
     """
-    result = "Current Gomoku Board (15x15):\n"
-    result += "Column:  " + "".join(f"{i:2}" for i in range(15)) + "\n"
+    if encoding == "rle":
+        return board_to_rle_string(board)
+    if encoding == "coords":
+        return board_to_coords_string(board)
+
+    top, bottom, left, right = view_window(board)
+    result = f"Current Gomoku Board ({board.size}x{board.size}):\n"
+    if (top, bottom, left, right) != (0, board.size - 1, 0, board.size - 1):
+        result += (f"Showing rows {top}-{bottom} and columns {left}-{right} only; "
+                   "every cell outside this view is empty.\n")
+    result += "Column:  " + "".join(f"{i:2}" for i in range(left, right + 1)) + "\n"
     result += "Row:\n"
     
-    for i, row in enumerate(board):
+    rows = board.rows()
+    for i in range(top, bottom + 1):
         result += f"{i:2}:     "
-        for cell in row:
+        for cell in rows[i][left:right + 1]:
             if cell == 0:
                 result += " ."
             elif cell == 1:
@@ -188,16 +404,62 @@ def board_to_string(board):
     result += "  O = Player 2 pieces\n"
     result += "\nIMPORTANT: You can ONLY place your piece on positions marked with '.' (dot)\n"
     
-    # Add list of available moves for clarity
-    available_moves = []
-    for i in range(15):
-        for j in range(15):
-            if board[i][j] == 0:
-                available_moves.append(f"({i},{j})")
-    
-    if len(available_moves) > 0:
-        result += f"\nSome available positions: {', '.join(available_moves[:20])}"
-        if len(available_moves) > 20:
-            result += "... and more"
+    # Suggest the most promising empty cells shown, rather than the first ones in row order
+    candidates = [f"({i},{j})" for i, j in ranked_candidates(board, limit=None)
+                  if top <= i <= bottom and left <= j <= right][:TOP_CANDIDATES]
+    if candidates:
+        result += f"\nTop candidate positions: {', '.join(candidates)}"
     
-    return result
\ No newline at end of file
+    return result
+
+def view_window(board):
+    """
+    Returns the (top, bottom, left, right) rows and columns to render: the
+    whole board up to MAX_RENDER_SIZE, otherwise the bounding box of the
+    stones plus CROP_MARGIN, so prompts stay small on large boards.
+    """
+    last = board.size - 1
+    if board.size <= MAX_RENDER_SIZE:
+        return 0, last, 0, last
+    stones = board.occupied_cells()
+    if not stones:
+        centre = board.size // 2
+        return centre - CROP_MARGIN, centre + CROP_MARGIN, centre - CROP_MARGIN, centre + CROP_MARGIN
+    rows = [r for r, _ in stones]
+    cols = [c for _, c in stones]
+    return (max(0, min(rows) - CROP_MARGIN), min(last, max(rows) + CROP_MARGIN),
+            max(0, min(cols) - CROP_MARGIN), min(last, max(cols) + CROP_MARGIN))
+
+def board_to_rle_string(board):
+    """
+    Encodes each row as runs of '.', 'X' and 'O', with the run length
+    written before the symbol when it is longer than one (e.g. "6.X8.").
+    Large boards are cropped to view_window.
+    """
+    top, bottom, left, right = view_window(board)
+    if (top, bottom, left, right) == (0, board.size - 1, 0, board.size - 1):
+        result = f"Rows 0-{board.size - 1}, each run-length encoded left to right (e.g. '6.X8.' = 6 empty, X, 8 empty):\n"
+    else:
+        result = (f"Rows {top}-{bottom}, columns {left}-{right} of a {board.size}x{board.size} board, each run-length "
+                  "encoded left to right (e.g. '6.X8.' = 6 empty, X, 8 empty); all other cells are empty:\n")
+    rows = board.rows()
+    for i in range(top, bottom + 1):
+        row = rows[i][left:right + 1]
+        runs = []
+        previous, length = None, 0
+        for cell in row + [None]:
+            if cell == previous:
+                length += 1
+                continue
+            if previous is not None:
+                symbol = ".XO"[previous]
+                runs.append(f"{length}{symbol}" if length > 1 else symbol)
+            previous, length = cell, 1
+        result += f"{i}:{''.join(runs)}\n"
+    return result
+
+def board_to_coords_string(board):
+    """Lists only the occupied cells of each player as row,col pairs."""
+    x_stones = " ".join(f"{i},{j}" for i, j in board.occupied_cells(1)) or "none"
+    o_stones = " ".join(f"{i},{j}" for i, j in board.occupied_cells(2)) or "none"
+    return f"X stones: {x_stones}\nO stones: {o_stones}\nAll other cells are empty.\n"
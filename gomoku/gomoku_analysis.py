@@ -0,0 +1,195 @@
+# gomoku_analysis.py
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from gomoku_board import BOARD_SIZE, WIN_LENGTH, GomokuBoard
+from gomoku_cache import TRANSFORMS, canonical_board
+from gomoku_engine import WIN_SCORE, GomokuEngine
+from gomoku_records import DEFAULT_STORE_PATH, ReplayStore
+from gomoku_tactics import winning_cells
+
+# A move that loses at least this much evaluation (about an open four) is a blunder.
+BLUNDER_MARGIN = 50_000
+ANALYSIS_DEPTH = 2
+
+# Set in every worker process by _init_worker.
+_engine = None
+
+
+def _init_worker(depth, time_limit):
+    global _engine
+    _engine = GomokuEngine(max_depth=depth, time_limit=time_limit)
+
+
+def evaluate_position(task):
+    """
+    Evaluates one canonical position in a worker process.
+
+    Args:
+        task: (canonical board key, board size, win length, player to move).
+
+    Returns:
+        (task, facts): facts holds the search score for the player to move and
+        the canonical cell indexes where the player wins ("wins") or where the
+        opponent would win ("threats").
+    """
+    key, size, win_length, player = task
+    rows = [[int(cell) for cell in key[i * size:(i + 1) * size]] for i in range(size)]
+    board = GomokuBoard.from_rows(rows, win_length)
+    score, _ = _engine.search(board, player)
+    wins = winning_cells(board, player)
+    threats = winning_cells(board, 3 - player)
+    return task, {
+        "score": score,
+        "wins": [row * size + col for row, col in wins],
+        "threats": [row * size + col for row, col in threats],
+    }
+
+
+def game_positions(record):
+    """
+    Yields (task, transform, player, move) for every move of a game, where
+    task identifies the position before the move, followed by one final
+    (task, transform, player, None) for the position after the last move.
+    """
+    size = record.get("board_size", BOARD_SIZE)
+    win_length = record.get("win_length", WIN_LENGTH)
+    board = GomokuBoard(size, win_length)
+    player = 1
+    for row, col in record["moves"]:
+        key, transform = canonical_board(board)
+        yield (key, size, win_length, player), transform, player, (row, col)
+        board.place(row, col, player)
+        player = 3 - player
+    key, transform = canonical_board(board)
+    yield (key, size, win_length, player), transform, player, None
+
+
+def classify_move(before, after, cell, won):
+    """
+    Returns "missed_win", "missed_block", "blunder" or None for a move played
+    in the position described by before, leading to after. A None cell (no
+    move, e.g. on a full board) is never classified.
+    """
+    if cell is None:
+        return None
+    if before["wins"] and cell not in before["wins"]:
+        return "missed_win"
+    if won or before["wins"]:
+        return None
+    if before["threats"] and cell not in before["threats"]:
+        return "missed_block"
+    score_after = -after["score"]
+    if before["score"] <= -WIN_SCORE:
+        return None
+    if score_after <= -WIN_SCORE or before["score"] - score_after >= BLUNDER_MARGIN:
+        return "blunder"
+    return None
+
+
+def _new_stats():
+    return {"games": 0, "moves": 0, "missed_win": 0, "missed_block": 0, "blunder": 0,
+            "wins": 0, "losses": 0, "draws": 0}
+
+
+def analyze_games(records, workers=None, depth=ANALYSIS_DEPTH, time_limit=5.0):
+    """
+    Scores every move of the given game records.
+
+    Positions are canonicalized across the 8 board symmetries and each
+    distinct one is evaluated once, spread over a process pool.
+
+    Returns:
+        (stats, evaluated, total): per-model statistics, the number of distinct
+        positions searched and the number of positions seen.
+    """
+    games = [list(game_positions(record)) for record in records]
+    tasks = {}
+    total = 0
+    for positions in games:
+        for task, _, _, _ in positions:
+            tasks.setdefault(task, None)
+            total += 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(depth, time_limit)) as pool:
+        for task, facts in pool.map(evaluate_position, tasks, chunksize=16):
+            tasks[task] = facts
+
+    stats = {}
+    for record, positions in zip(records, games):
+        models = {1: record["player_1"], 2: record["player_2"]}
+        for i, (task, transform, player, move) in enumerate(positions[:-1]):
+            size = task[1]
+            row, col = TRANSFORMS[transform](move[0], move[1], size)
+            won = record["result"] == "five" and i == len(positions) - 2
+            before, after = tasks[task], tasks[positions[i + 1][0]]
+            mistake = classify_move(before, after, row * size + col, won)
+
+            model_stats = stats.setdefault(models[player], _new_stats())
+            model_stats["moves"] += 1
+            if mistake:
+                model_stats[mistake] += 1
+
+        for player, model in models.items():
+            model_stats = stats.setdefault(model, _new_stats())
+            model_stats["games"] += 1
+            if record["winner"] is None:
+                model_stats["draws"] += 1
+            elif record["winner"] == player:
+                model_stats["wins"] += 1
+            else:
+                model_stats["losses"] += 1
+    return stats, len(tasks), total
+
+
+def print_analysis(stats):
+    """Prints per-model mistake counts and rates per 100 moves."""
+    print("\n" + "=" * 77)
+    print(f"  {'Model':<20}{'Games':>7}{'Moves':>7}{'Missed win':>12}{'Missed block':>14}{'Blunder':>9}{'Per 100':>8}")
+    print("=" * 77)
+    for model, s in sorted(stats.items()):
+        mistakes = s["missed_win"] + s["missed_block"] + s["blunder"]
+        rate = mistakes / s["moves"] * 100 if s["moves"] else 0
+        print(f"  {model:<20}{s['games']:>7}{s['moves']:>7}{s['missed_win']:>12}{s['missed_block']:>14}"
+              f"{s['blunder']:>9}{rate:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score every move of recorded Gomoku games with the local engine.")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Binary replay store (path without extension)")
+    parser.add_argument("--from-log", action="append", default=[],
+                        help="Also analyze a tournament JSONL results file; repeatable")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--depth", type=int, default=ANALYSIS_DEPTH,
+                        help=f"Search depth per position (default: {ANALYSIS_DEPTH})")
+    parser.add_argument("--time-limit", type=float, default=5.0, help="Search time limit per position in seconds")
+    parser.add_argument("--output", default="analysis.json", help="JSON file the per-model statistics are written to")
+    args = parser.parse_args()
+
+    store = ReplayStore(args.store)
+    records = list(store)
+    store.close()
+    for path in args.from_log:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    if not records:
+        print("No games found. Record games first or pass --from-log.")
+        return
+
+    start = time.time()
+    stats, evaluated, total = analyze_games(records, args.workers, args.depth, args.time_limit)
+    print(f"Analyzed {len(records)} games in {time.time() - start:.1f}s: "
+          f"{evaluated} distinct positions searched out of {total}.")
+    print_analysis(stats)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+    print(f"\nPer-model statistics written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# gomoku_batch.py
+
+import numpy as np
+
+from gomoku_board import WIN_LENGTH
+
+
+def stack_boards(boards):
+    """Stacks GomokuBoard objects into an (N, size, size) int8 array of 0, 1 and 2."""
+    return np.array([board.rows() for board in boards], dtype=np.int8)
+
+
+def _five_starts(stones, win_length=WIN_LENGTH):
+    """
+    For a boolean (N, size, size) stone array, returns the cells where a run
+    of win_length stones starts, as (horizontal, vertical, diagonal,
+    anti_diagonal) arrays cropped to the valid start region of each direction.
+    Anti-diagonal runs are indexed by their top-left bounding cell.
+    """
+    n = stones.shape[-1]
+    span = n - win_length + 1
+    horizontal = np.ones((stones.shape[0], n, span), dtype=bool)
+    vertical = np.ones((stones.shape[0], span, n), dtype=bool)
+    diagonal = np.ones((stones.shape[0], span, span), dtype=bool)
+    anti_diagonal = np.ones((stones.shape[0], span, span), dtype=bool)
+    for k in range(win_length):
+        horizontal &= stones[:, :, k:k + span]
+        vertical &= stones[:, k:k + span, :]
+        diagonal &= stones[:, k:k + span, k:k + span]
+        anti_diagonal &= stones[:, k:k + span, win_length - 1 - k:win_length - 1 - k + span]
+    return horizontal, vertical, diagonal, anti_diagonal
+
+
+def batch_win_flags(boards, win_length=WIN_LENGTH):
+    """
+    Returns an (N, 2) bool array: [i, p - 1] is True if player p has five (or
+    more) in a row anywhere on board i.
+    """
+    boards = np.asarray(boards)
+    flags = np.zeros((boards.shape[0], 2), dtype=bool)
+    for player in (1, 2):
+        runs = _five_starts(boards == player, win_length)
+        flags[:, player - 1] = np.any([r.reshape(r.shape[0], -1).any(axis=1) for r in runs], axis=0)
+    return flags
+
+
+def batch_check_win(boards, players, rows, cols, win_length=WIN_LENGTH):
+    """
+    Vectorized check_win: for each board i, returns True if the stone of
+    players[i] at (rows[i], cols[i]) is part of five (or more) in a row.
+    """
+    boards = np.asarray(boards)
+    players = np.asarray(players)
+    rows = np.asarray(rows)
+    cols = np.asarray(cols)
+    n = boards.shape[-1]
+    span = n - win_length + 1
+    stones = boards == players[:, None, None]
+    horizontal, vertical, diagonal, anti_diagonal = _five_starts(stones, win_length)
+
+    # Spread every run start over the cells of its run.
+    covered = np.zeros(boards.shape, dtype=bool)
+    for k in range(win_length):
+        covered[:, :, k:k + span] |= horizontal
+        covered[:, k:k + span, :] |= vertical
+        covered[:, k:k + span, k:k + span] |= diagonal
+        covered[:, k:k + span, win_length - 1 - k:win_length - 1 - k + span] |= anti_diagonal
+
+    return covered[np.arange(boards.shape[0]), rows, cols] & stones[np.arange(boards.shape[0]), rows, cols]
+
+
+def batch_legal_masks(boards):
+    """Returns an (N, size, size) bool array that is True on every empty cell."""
+    return np.asarray(boards) == 0
+
+
+def analyze_boards(boards, win_length=WIN_LENGTH):
+    """Returns (win flags, legal-move masks) for a stacked (N, size, size) array of boards."""
+    return batch_win_flags(boards, win_length), batch_legal_masks(boards)
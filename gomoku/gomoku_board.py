@@ -0,0 +1,148 @@
+# gomoku_board.py
+
+BOARD_SIZE = 15
+WIN_LENGTH = 5
+
+# Row, column, diagonal and anti-diagonal directions as (dr, dc) pairs.
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class GomokuBoard:
+    """
+    Compact Gomoku board backed by one integer bitboard per player.
+
+    Cell (row, col) maps to bit row * (size + 1) + col. The spare bit at the
+    end of every row is never set, so shifting a bitboard by 1, size + 1,
+    size + 2 or size walks along a row, column, diagonal or anti-diagonal
+    without wrapping onto the next row. Copying a board copies two integers.
+
+    Any square size and win length work, e.g. 19x19 Gomoku or six in a row.
+    """
+
+    def __init__(self, size=BOARD_SIZE, win_length=WIN_LENGTH):
+        self.size = size
+        self.win_length = win_length
+        self.stride = size + 1
+        self.bits = {1: 0, 2: 0}
+        self.move_count = 0
+        self.shifts = [dr * self.stride + dc for dr, dc in DIRECTIONS]
+        self.playable = sum(1 << (i * self.stride + j) for i in range(size) for j in range(size))
+
+    @classmethod
+    def from_rows(cls, rows, win_length=WIN_LENGTH):
+        """Builds a board from a list of rows holding 0, 1 or 2 per cell."""
+        board = cls(len(rows), win_length)
+        for i, row in enumerate(rows):
+            for j, cell in enumerate(row):
+                if cell:
+                    board.place(i, j, cell)
+        return board
+
+    def copy(self):
+        """Returns an independent copy of the board."""
+        other = GomokuBoard.__new__(GomokuBoard)
+        other.size = self.size
+        other.win_length = self.win_length
+        other.stride = self.stride
+        other.bits = dict(self.bits)
+        other.move_count = self.move_count
+        other.shifts = self.shifts
+        other.playable = self.playable
+        return other
+
+    def key(self):
+        """Returns a hashable snapshot of the position."""
+        return self.bits[1], self.bits[2]
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def get(self, row, col):
+        """Returns 0 for an empty cell, otherwise the player who owns it."""
+        bit = 1 << (row * self.stride + col)
+        if self.bits[1] & bit:
+            return 1
+        if self.bits[2] & bit:
+            return 2
+        return 0
+
+    def is_empty(self, row, col):
+        bit = 1 << (row * self.stride + col)
+        return not (self.bits[1] | self.bits[2]) & bit
+
+    def is_full(self):
+        return self.move_count == self.size * self.size
+
+    def place(self, row, col, player):
+        """Places a stone for the player on an empty cell."""
+        if not self.is_empty(row, col):
+            raise ValueError(f"Position ({row},{col}) is already occupied.")
+        self.bits[player] |= 1 << (row * self.stride + col)
+        self.move_count += 1
+
+    def remove(self, row, col):
+        """Takes back the stone on (row, col); used by search to undo moves."""
+        bit = 1 << (row * self.stride + col)
+        if not (self.bits[1] | self.bits[2]) & bit:
+            raise ValueError(f"Position ({row},{col}) is already empty.")
+        self.bits[1] &= ~bit
+        self.bits[2] &= ~bit
+        self.move_count -= 1
+
+    def check_win(self, player, row, col):
+        """
+        Checks if the stone at (row, col) completes win_length in a row for
+        the player. Walks at most win_length - 1 cells each way per line.
+        """
+        stones = self.bits[player]
+        index = row * self.stride + col
+        for shift in self.shifts:
+            length = 1
+            for step in (shift, -shift):
+                position = index + step
+                while length < self.win_length and position >= 0 and stones >> position & 1:
+                    length += 1
+                    position += step
+            if length >= self.win_length:
+                return True
+        return False
+
+    def occupied_cells(self, player=None):
+        """Returns the (row, col) of every stone, in row-major order."""
+        if player is None:
+            return self.cells_from_mask(self.bits[1] | self.bits[2])
+        return self.cells_from_mask(self.bits[player])
+
+    def neighbour_mask(self, distance=1):
+        """
+        Returns the bitboard of empty cells within `distance` steps (in any of
+        the eight directions) of an existing stone.
+        """
+        taken = self.bits[1] | self.bits[2]
+        area = taken
+        for _ in range(distance):
+            grown = area
+            for shift in self.shifts:
+                grown |= (area << shift) | (area >> shift)
+            # Mask after every step so nothing wraps across the guard column.
+            area = grown & self.playable
+        return area & ~taken
+
+    def cells_from_mask(self, mask):
+        """Returns the (row, col) of every bit set in a bitboard, in row-major order."""
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(divmod(low.bit_length() - 1, self.stride))
+            mask ^= low
+        return cells
+
+    def empty_cells(self):
+        """Returns the (row, col) of every empty cell, in row-major order."""
+        taken = self.bits[1] | self.bits[2]
+        return [(i, j) for i in range(self.size) for j in range(self.size)
+                if not taken >> (i * self.stride + j) & 1]
+
+    def rows(self):
+        """Returns the board as a list of rows holding 0, 1 or 2 per cell."""
+        return [[self.get(i, j) for j in range(self.size)] for i in range(self.size)]
@@ -0,0 +1,184 @@
+# gomoku_book.py
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+
+from gomoku_board import BOARD_SIZE, WIN_LENGTH, GomokuBoard
+from gomoku_cache import INVERSE_TRANSFORMS, TRANSFORMS, canonical_board
+from gomoku_engine import GomokuEngine, self_play_game
+
+DEFAULT_BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+# Number of plies the book covers; later positions always go to the model.
+BOOK_PLIES = 10
+
+# File layout: header, then records sorted by position key.
+#   header: magic, board size, record count
+#   record: 64-bit position key, canonical cell index, weight
+BOOK_MAGIC = b"GMKBOOK1"
+HEADER = struct.Struct("<8sHI")
+RECORD = struct.Struct("<QHH")
+
+
+def position_key(board, player):
+    """
+    Returns (key, transform): a 64-bit hash of the canonical board and the
+    player to move, and the TRANSFORMS index that canonicalizes the board.
+    """
+    canonical, transform = canonical_board(board)
+    digest = hashlib.blake2b(f"{player}:{canonical}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little"), transform
+
+
+class OpeningBook:
+    """
+    Read-only, symmetry-normalized position-to-move table.
+
+    The file is memory-mapped, so opening it is instant and concurrent
+    processes share its pages. Lookups binary-search the sorted keys.
+    """
+
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self.size = BOARD_SIZE
+        self.count = 0
+        self._mmap = None
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self.size, self.count = HEADER.unpack_from(self._mmap, 0)
+            if magic != BOOK_MAGIC or len(self._mmap) < HEADER.size + self.count * RECORD.size:
+                # The book is optional: a foreign or truncated file just means no book moves
+                print(f"Warning: {path} is not a valid opening book file; playing without a book.")
+                self.close()
+                self.size, self.count = BOARD_SIZE, 0
+
+    def __len__(self):
+        return self.count
+
+    def _key_at(self, index):
+        return RECORD.unpack_from(self._mmap, HEADER.size + index * RECORD.size)[0]
+
+    def lookup(self, board, player):
+        """Returns the book move (row, col) for this position, or None."""
+        if not self.count or board.size != self.size or board.win_length != WIN_LENGTH:
+            return None
+        key, transform = position_key(board, player)
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count:
+            return None
+        found_key, cell, _ = RECORD.unpack_from(self._mmap, HEADER.size + low * RECORD.size)
+        if found_key != key:
+            return None
+        inverse = TRANSFORMS[INVERSE_TRANSFORMS[transform]]
+        return inverse(cell // board.size, cell % board.size, board.size)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+def collect_book_moves(games, max_plies=BOOK_PLIES, board_size=BOARD_SIZE):
+    """
+    Counts how often each move was played in each of the first max_plies
+    positions. Moves by the eventual winner count double. The first
+    skip_plies moves of a game (e.g. a random self-play opening) are played
+    out but not counted. Games on another board size or win length than the
+    book's are skipped.
+
+    Args:
+        games: iterable of (moves, winner, skip_plies, board_size, win_length),
+            moves as (row, col) lists.
+
+    Returns:
+        dict: position key -> {canonical cell index: weight}
+    """
+    table = {}
+    for moves, winner, skip_plies, game_size, win_length in games:
+        if game_size != board_size or win_length != WIN_LENGTH:
+            continue
+        board = GomokuBoard(board_size)
+        player = 1
+        for ply, (row, col) in enumerate(moves[:max_plies]):
+            if ply >= skip_plies:
+                key, transform = position_key(board, player)
+                canonical_row, canonical_col = TRANSFORMS[transform](row, col, board_size)
+                cell = canonical_row * board_size + canonical_col
+                weights = table.setdefault(key, {})
+                weights[cell] = weights.get(cell, 0) + (2 if player == winner else 1)
+            board.place(row, col, player)
+            player = 3 - player
+    return table
+
+
+def write_book(path, table, board_size=BOARD_SIZE):
+    """Writes the most played move of every position to a book file."""
+    records = []
+    for key, weights in table.items():
+        cell, weight = max(weights.items(), key=lambda item: item[1])
+        records.append((key, cell, min(weight, 0xFFFF)))
+    records.sort()
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(BOOK_MAGIC, board_size, len(records)))
+        for record in records:
+            f.write(RECORD.pack(*record))
+    return len(records)
+
+
+def read_game_log(path):
+    """Yields (moves, winner, 0, board_size, win_length) from a tournament JSONL results file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield ([tuple(move) for move in record["moves"]], record.get("winner"), 0,
+                       record.get("board_size", BOARD_SIZE), record.get("win_length", WIN_LENGTH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Gomoku opening book from game logs and engine self-play.")
+    parser.add_argument("--from-log", action="append", default=[],
+                        help="Tournament JSONL results file to learn from; repeatable")
+    parser.add_argument("--self-play", type=int, default=0, help="Number of local engine self-play games to add")
+    parser.add_argument("--plies", type=int, default=BOOK_PLIES, help=f"Plies covered by the book (default: {BOOK_PLIES})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_BOOK_PATH)
+    args = parser.parse_args()
+
+    games = []
+    for path in args.from_log:
+        games.extend(read_game_log(path))
+    if args.self_play:
+        rng = random.Random(args.seed)
+        engine = GomokuEngine(max_depth=2)
+        for i in range(args.self_play):
+            moves, winner, opening_plies = self_play_game(engine, rng)
+            games.append((moves, winner, opening_plies, BOARD_SIZE, WIN_LENGTH))
+            print(f"Self-play game {i + 1}/{args.self_play} done.")
+    matching = [game for game in games if game[3] == BOARD_SIZE and game[4] == WIN_LENGTH]
+    if len(matching) < len(games):
+        print(f"Skipping {len(games) - len(matching)} games not played on a {BOARD_SIZE}x{BOARD_SIZE} "
+              f"board with {WIN_LENGTH} in a row.")
+    games = matching
+    if not games:
+        print("No games given. Use --from-log and/or --self-play.")
+        return
+
+    table = collect_book_moves(games, args.plies)
+    count = write_book(args.output, table)
+    print(f"Wrote {count} positions from {len(games)} games to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# gomoku_cache.py
+
+import os
+import sqlite3
+import threading
+
+from gomoku_board import WIN_LENGTH
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "move_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 100_000
+
+# The 8 symmetries of a square board, as functions of (row, col, size).
+TRANSFORMS = [
+    lambda r, c, n: (r, c),
+    lambda r, c, n: (c, n - 1 - r),
+    lambda r, c, n: (n - 1 - r, n - 1 - c),
+    lambda r, c, n: (n - 1 - c, r),
+    lambda r, c, n: (r, n - 1 - c),
+    lambda r, c, n: (n - 1 - r, c),
+    lambda r, c, n: (c, r),
+    lambda r, c, n: (n - 1 - c, n - 1 - r),
+]
+
+# Index of the transform that undoes each entry of TRANSFORMS.
+INVERSE_TRANSFORMS = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def canonical_board(board):
+    """
+    Returns (key, transform) where key is the lexicographically smallest of
+    the 8 dihedral images of the board and transform is the index in
+    TRANSFORMS that produces it.
+    """
+    n = board.size
+    stones = [(r, c, board.get(r, c)) for r, c in board.occupied_cells()]
+    best_key, best_transform = None, 0
+    for index, transform in enumerate(TRANSFORMS):
+        cells = ["0"] * (n * n)
+        for r, c, player in stones:
+            tr, tc = transform(r, c, n)
+            cells[tr * n + tc] = str(player)
+        key = "".join(cells)
+        if best_key is None or key < best_key:
+            best_key, best_transform = key, index
+    return best_key, best_transform
+
+
+def _cache_key(board):
+    """Canonical board key, tagged with the win length for non-standard variants."""
+    key, transform = canonical_board(board)
+    if board.win_length != WIN_LENGTH:
+        key = f"{board.win_length}:{key}"
+    return key, transform
+
+
+class MoveCache:
+    """
+    Persistent LLM move cache keyed on (model, player, canonical board).
+
+    Moves are stored in canonical coordinates and mapped back through the
+    inverse transform on lookup, so all 8 symmetric variants of a position
+    share one entry. The least recently used entries are evicted once the
+    store grows past max_entries.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS moves ("
+                " model TEXT, player INTEGER, board TEXT, row INTEGER, col INTEGER,"
+                " last_used INTEGER, PRIMARY KEY (model, player, board))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS moves_last_used ON moves (last_used)")
+            self._clock = self._conn.execute("SELECT COALESCE(MAX(last_used), 0) FROM moves").fetchone()[0]
+            # Entry count, kept up to date on insert and eviction instead of scanning the table each time
+            self._count = self._conn.execute("SELECT COUNT(*) FROM moves").fetchone()[0]
+        return self._conn
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def lookup(self, model_name, player, board):
+        """Returns the cached (row, col) for this position, or None."""
+        key, transform = _cache_key(board)
+        with self._lock:
+            conn = self._connection()
+            found = conn.execute(
+                "SELECT row, col FROM moves WHERE model = ? AND player = ? AND board = ?",
+                (model_name, player, key),
+            ).fetchone()
+            if found is None:
+                self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE moves SET last_used = ? WHERE model = ? AND player = ? AND board = ?",
+                (self._tick(), model_name, player, key),
+            )
+            conn.commit()
+        self.hits += 1
+        inverse = TRANSFORMS[INVERSE_TRANSFORMS[transform]]
+        return inverse(found[0], found[1], board.size)
+
+    def store(self, model_name, player, board, move):
+        """Records the move the model chose for this position."""
+        key, transform = _cache_key(board)
+        row, col = TRANSFORMS[transform](move[0], move[1], board.size)
+        with self._lock:
+            conn = self._connection()
+            updated = conn.execute(
+                "UPDATE moves SET row = ?, col = ?, last_used = ? WHERE model = ? AND player = ? AND board = ?",
+                (row, col, self._tick(), model_name, player, key),
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    "INSERT OR REPLACE INTO moves VALUES (?, ?, ?, ?, ?, ?)",
+                    (model_name, player, key, row, col, self._tick()),
+                )
+                self._count += 1
+            excess = self._count - self.max_entries
+            if excess > 0:
+                self._count -= conn.execute(
+                    "DELETE FROM moves WHERE rowid IN "
+                    "(SELECT rowid FROM moves ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                ).rowcount
+            conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,303 @@
+# gomoku_engine.py
+
+import random
+import threading
+import time
+
+from gomoku_board import BOARD_SIZE, WIN_LENGTH, GomokuBoard
+
+# Model name that selects the local engine in PLAYER_MODELS.
+ENGINE_MODEL = "local-engine"
+
+WIN_SCORE = 10_000_000
+
+# Score of a contiguous run, indexed by [run length][number of open ends],
+# for five in a row. Other win lengths use the row as far from a win.
+RUN_SCORES = {
+    1: (0, 1, 10),
+    2: (0, 10, 100),
+    3: (0, 100, 1_000),
+    4: (0, 1_000, 100_000),
+}
+
+
+def _run_scores(length, win_length):
+    """Returns the RUN_SCORES row for a run that is win_length - length stones short of a win."""
+    return RUN_SCORES[min(4, max(1, length + 5 - win_length))]
+
+# Zobrist keys, keyed by (board size, win length). The same stones score
+# differently under another win length, so each rule set gets its own keys
+# and a shared transposition table never mixes their entries.
+_zobrist_cache = {}
+
+
+def _zobrist_keys(board):
+    """Returns per-player random 64-bit keys for every bit index of the board."""
+    rules = (board.size, board.win_length)
+    if rules not in _zobrist_cache:
+        rng = random.Random(board.size * 1000 + board.win_length)
+        cells = board.size * board.stride
+        _zobrist_cache[rules] = {
+            1: [rng.getrandbits(64) for _ in range(cells)],
+            2: [rng.getrandbits(64) for _ in range(cells)],
+        }
+    return _zobrist_cache[rules]
+
+
+def _popcount(bits):
+    return bin(bits).count("1")
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class GomokuEngine:
+    """
+    Iterative-deepening alpha-beta (negamax) search over a GomokuBoard.
+
+    Candidate moves are limited to empty cells next to existing stones and
+    ordered by a cheap threat heuristic. Positions are cached in a
+    Zobrist-hashed transposition table that survives between moves.
+    """
+
+    def __init__(self, max_depth=4, time_limit=1.0, max_candidates=12, max_table_size=500_000):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.max_candidates = max_candidates
+        self.max_table_size = max_table_size
+        self.table = {}
+        self.nodes = 0
+        self._deadline = None
+
+    def best_move(self, board, player):
+        """Returns the (row, col) the engine would play for the player."""
+        return self.search(board, player)[1]
+
+    def search(self, board, player):
+        """
+        Returns (score, (row, col)): the score of the deepest completed search
+        from the player's point of view, and the move it chose. The move is
+        None when the board is full (the score is then the static evaluation).
+        """
+        if board.move_count == 0:
+            return 0, (board.size // 2, board.size // 2)
+
+        board = board.copy()
+        keys = _zobrist_keys(board)
+        position_hash = 0
+        for p in (1, 2):
+            for row, col in board.occupied_cells(p):
+                position_hash ^= keys[p][row * board.stride + col]
+
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+
+        self.nodes = 0
+        self._deadline = time.time() + self.time_limit
+        moves = self._ordered_moves(board, player, None)
+        if not moves:
+            return self.evaluate(board, player), None
+        best, best_score = moves[0], self.evaluate(board, player)
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._search_root(board, player, depth, position_hash, best)
+            except _SearchTimeout:
+                break
+            best, best_score = move, score
+            if abs(score) >= WIN_SCORE:
+                break
+        return best_score, best
+
+    def _search_root(self, board, player, depth, position_hash, previous_best):
+        keys = _zobrist_keys(board)
+        opponent = 3 - player
+        alpha, beta = -WIN_SCORE * 2, WIN_SCORE * 2
+        best_score, best_move = -WIN_SCORE * 2, previous_best
+        for row, col in self._ordered_moves(board, player, previous_best):
+            board.place(row, col, player)
+            if board.check_win(player, row, col):
+                score = WIN_SCORE + depth
+            elif board.is_full():
+                score = 0
+            else:
+                child_hash = position_hash ^ keys[player][row * board.stride + col]
+                score = -self._negamax(board, opponent, depth - 1, -beta, -alpha, child_hash)
+            board.remove(row, col)
+            if score > best_score:
+                best_score, best_move = score, (row, col)
+            alpha = max(alpha, score)
+        return best_score, best_move
+
+    def _negamax(self, board, player, depth, alpha, beta, position_hash):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.time() > self._deadline:
+            raise _SearchTimeout()
+
+        original_alpha = alpha
+        entry = self.table.get(position_hash)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, table_move = entry
+            if entry_depth >= depth:
+                if entry_flag == 0:
+                    return entry_score
+                if entry_flag < 0:
+                    beta = min(beta, entry_score)
+                else:
+                    alpha = max(alpha, entry_score)
+                if alpha >= beta:
+                    return entry_score
+
+        if depth == 0:
+            return self.evaluate(board, player)
+
+        keys = _zobrist_keys(board)
+        opponent = 3 - player
+        best_score, best_move = -WIN_SCORE * 2, None
+        for row, col in self._ordered_moves(board, player, table_move):
+            board.place(row, col, player)
+            if board.check_win(player, row, col):
+                score = WIN_SCORE + depth
+            elif board.is_full():
+                score = 0
+            else:
+                child_hash = position_hash ^ keys[player][row * board.stride + col]
+                score = -self._negamax(board, opponent, depth - 1, -beta, -alpha, child_hash)
+            board.remove(row, col)
+            if score > best_score:
+                best_score, best_move = score, (row, col)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = -1  # Upper bound
+        elif best_score >= beta:
+            flag = 1  # Lower bound
+        else:
+            flag = 0  # Exact
+        self.table[position_hash] = (depth, best_score, flag, best_move)
+        return best_score
+
+    def ranked_moves(self, board, player, limit=None):
+        """Returns the candidate moves for the player, most promising first."""
+        moves = self._ordered_moves(board, player, None)
+        return moves if limit is None else moves[:limit]
+
+    def _ordered_moves(self, board, player, first_move):
+        """Returns the candidate moves, best-looking first, capped at max_candidates."""
+        candidates = board.cells_from_mask(board.neighbour_mask(1))
+        opponent = 3 - player
+        scored = []
+        for row, col in candidates:
+            attack = self.move_score(board, row, col, player)
+            defense = self.move_score(board, row, col, opponent)
+            scored.append((attack + defense, (row, col)))
+        scored.sort(reverse=True)
+        moves = [move for _, move in scored[:self.max_candidates]]
+        if first_move is not None and first_move in candidates:
+            if first_move in moves:
+                moves.remove(first_move)
+            moves.insert(0, first_move)
+        return moves
+
+    def move_score(self, board, row, col, player):
+        """Scores the runs the player would form by placing a stone on (row, col)."""
+        stones = board.bits[player]
+        empty = board.playable & ~(board.bits[1] | board.bits[2])
+        index = row * board.stride + col
+        total = 0
+        for shift in board.shifts:
+            length, open_ends = 1, 0
+            for step in (shift, -shift):
+                position = index + step
+                while position >= 0 and stones >> position & 1:
+                    length += 1
+                    position += step
+                if position >= 0 and empty >> position & 1:
+                    open_ends += 1
+            if length >= board.win_length:
+                total += WIN_SCORE
+            else:
+                total += _run_scores(length, board.win_length)[open_ends]
+        return total
+
+    def evaluate(self, board, player):
+        """Static evaluation from the point of view of the player to move."""
+        return self._run_score(board, player) - self._run_score(board, 3 - player)
+
+    def _run_score(self, board, player):
+        stones = board.bits[player]
+        empty = board.playable & ~(board.bits[1] | board.bits[2])
+        total = 0
+        for shift in board.shifts:
+            # Bits where a run of the player's stones starts in this direction.
+            chain = stones & ~(stones << shift)
+            open_before = empty << shift
+            for length in range(1, board.win_length):
+                if length > 1:
+                    chain &= stones >> ((length - 1) * shift)
+                if not chain:
+                    break
+                exact = chain & ~(stones >> (length * shift))
+                before = exact & open_before
+                after = exact & (empty >> (length * shift))
+                both = _popcount(before & after)
+                one = _popcount(before | after) - both
+                scores = _run_scores(length, board.win_length)
+                total += both * scores[2] + one * scores[1]
+        return total
+
+
+# One engine (and transposition table) per thread, so games can run in parallel.
+_thread_engines = threading.local()
+
+
+def default_engine():
+    """Returns this thread's shared engine instance."""
+    if not hasattr(_thread_engines, "engine"):
+        _thread_engines.engine = GomokuEngine()
+    return _thread_engines.engine
+
+
+def get_engine_move(board, player, verbose=True):
+    """Returns a move from this thread's local engine instance."""
+    engine = default_engine()
+    start = time.time()
+    move = engine.best_move(board, player)
+    if verbose and move is not None:
+        print(f"Local engine chose ({move[0]},{move[1]}) in {time.time() - start:.2f}s "
+              f"({engine.nodes} nodes).")
+    return move
+
+
+def self_play_game(engine, rng, board_size=BOARD_SIZE, random_opening=4, win_length=WIN_LENGTH):
+    """
+    Plays one engine-vs-engine game after 1 to random_opening random moves
+    near the centre, so repeated games differ.
+
+    Returns:
+        (moves, winner, opening_plies): the list of (row, col) moves, the
+        winning player or None for a draw, and how many of the moves were
+        the random opening rather than engine choices.
+    """
+    board = GomokuBoard(board_size, win_length)
+    centre = board_size // 2
+    moves = []
+    player = 1
+    for _ in range(rng.randint(1, random_opening)):
+        row, col = rng.randint(centre - 2, centre + 2), rng.randint(centre - 2, centre + 2)
+        if board.is_empty(row, col):
+            board.place(row, col, player)
+            moves.append((row, col))
+            player = 3 - player
+    opening_plies = len(moves)
+    while not board.is_full():
+        row, col = engine.best_move(board, player)
+        board.place(row, col, player)
+        moves.append((row, col))
+        if board.check_win(player, row, col):
+            return moves, player, opening_plies
+        player = 3 - player
+    return moves, None, opening_plies
@@ -0,0 +1,221 @@
+# gomoku_env.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from gomoku_batch import batch_check_win
+from gomoku_board import BOARD_SIZE, WIN_LENGTH, GomokuBoard
+from gomoku_engine import get_engine_move
+
+
+def llm_opponent(model_name, **move_options):
+    """
+    Wraps get_ai_move as an opponent policy: a callable (board, player) ->
+    (row, col). Extra keyword arguments are passed to get_ai_move.
+    """
+    from gomoku_ai_player import get_ai_move
+
+    def policy(board, player):
+        return get_ai_move(board, player, model_name, verbose=False, **move_options)
+    return policy
+
+
+def engine_opponent(board, player):
+    """Opponent policy that plays the local alpha-beta engine."""
+    return get_engine_move(board, player, verbose=False)
+
+
+class GomokuEnv:
+    """
+    Single-game Gomoku environment with a gym-style reset/step interface.
+
+    Actions are cell indices row * size + col. Observations are (size, size)
+    int8 arrays of 0, 1 and 2. With an opponent policy the agent plays
+    agent_player and the opponent answers inside step; without one, step
+    plays for whoever is to move. Rewards are +1 for a win and -1 for a loss
+    from the point of view of the agent (or of the player who just moved).
+    """
+
+    def __init__(self, board_size=BOARD_SIZE, win_length=WIN_LENGTH, opponent=None, agent_player=1):
+        self.board_size = board_size
+        self.win_length = win_length
+        self.opponent = opponent
+        self.agent_player = agent_player
+        self.board = None
+        self.current_player = 1
+        self.done = True
+
+    def observation(self):
+        return np.array(self.board.rows(), dtype=np.int8)
+
+    def legal_mask(self):
+        """Returns a (size * size,) bool array that is True on every empty cell."""
+        return self.observation().ravel() == 0
+
+    def reset(self):
+        """Starts a new game and returns the first observation."""
+        self.board = GomokuBoard(self.board_size, self.win_length)
+        self.current_player = 1
+        self.done = False
+        if self.opponent is not None and self.agent_player != 1:
+            self._play(self.opponent(self.board, 1))
+        return self.observation()
+
+    def _play(self, move):
+        """Places a stone for the player to move; returns True if it ends the game."""
+        row, col = move
+        player = self.current_player
+        self.board.place(row, col, player)
+        self.current_player = 3 - player
+        if self.board.check_win(player, row, col):
+            self.done = True
+            return player
+        if self.board.is_full():
+            self.done = True
+        return None
+
+    def step(self, action):
+        """
+        Plays action for the agent (and the opponent's answer, if any).
+
+        Returns:
+            (observation, reward, done, info): info holds "winner" (None while
+            the game runs or on a draw) and "legal_mask".
+        """
+        if self.done:
+            raise ValueError("The game is over; call reset() first.")
+        mover = self.current_player
+        winner = self._play(divmod(int(action), self.board_size))
+        if not self.done and self.opponent is not None:
+            move = self.opponent(self.board, self.current_player)
+            if move is None:
+                # An opponent that cannot move forfeits, as in the game scripts.
+                self.done = True
+                winner = mover
+            else:
+                winner = self._play(move)
+
+        me = self.agent_player if self.opponent is not None else mover
+        reward = 0.0 if winner is None else (1.0 if winner == me else -1.0)
+        return self.observation(), reward, self.done, {"winner": winner, "legal_mask": self.legal_mask()}
+
+
+class VectorGomokuEnv:
+    """
+    Steps num_envs Gomoku games at once on a (num_envs, size, size) int8 array.
+
+    Moves are placed with fancy indexing and checked with batch_check_win,
+    the vectorized form of GomokuBoard.check_win. Finished games are reset
+    automatically; their final boards are returned in info["final_boards"].
+    An opponent policy is called per game on a GomokuBoard view of that game,
+    on a thread pool so that LLM opponents answer concurrently. If the
+    opponent's opening move after a reset already ends a game (a forfeit),
+    the result is reported as done on the next step, whose action for that
+    game is ignored.
+    """
+
+    def __init__(self, num_envs, board_size=BOARD_SIZE, win_length=WIN_LENGTH, opponent=None, agent_player=1,
+                 opponent_workers=8):
+        self.num_envs = num_envs
+        self.board_size = board_size
+        self.win_length = win_length
+        self.opponent = opponent
+        self.agent_player = agent_player
+        self._pool = ThreadPoolExecutor(max_workers=opponent_workers) if opponent is not None else None
+        self.boards = np.zeros((num_envs, board_size, board_size), dtype=np.int8)
+        self.current_player = np.ones(num_envs, dtype=np.int8)
+        self.move_counts = np.zeros(num_envs, dtype=np.int32)
+        # Winner of a game that ended during its reset, -1 while none is pending
+        self.pending_winners = np.full(num_envs, -1, dtype=np.int8)
+
+    def legal_masks(self):
+        """Returns a (num_envs, size * size) bool array of empty cells."""
+        return self.boards.reshape(self.num_envs, -1) == 0
+
+    def reset(self, indices=None):
+        """Resets the given games (default: all) and returns all observations."""
+        if indices is None:
+            indices = np.arange(self.num_envs)
+        self.boards[indices] = 0
+        self.current_player[indices] = 1
+        self.move_counts[indices] = 0
+        self.pending_winners[indices] = -1
+        if self.opponent is not None and self.agent_player != 1:
+            indices = np.asarray(indices)
+            winners, done = self._opponent_moves(indices)
+            self.pending_winners[indices[done]] = winners[done]
+        return self.boards.copy()
+
+    def _place(self, indices, cells):
+        """Places the movers' stones; returns (winner per index, done per index)."""
+        rows, cols = np.divmod(cells, self.board_size)
+        players = self.current_player[indices]
+        if (self.boards[indices, rows, cols] != 0).any():
+            raise ValueError("Illegal move: cell already occupied.")
+        self.boards[indices, rows, cols] = players
+        self.move_counts[indices] += 1
+        self.current_player[indices] = 3 - players
+        won = batch_check_win(self.boards[indices], players, rows, cols, self.win_length)
+        full = self.move_counts[indices] == self.board_size * self.board_size
+        return np.where(won, players, 0), won | full
+
+    def _opponent_moves(self, indices):
+        """Asks the opponent for a move in every listed game and plays them."""
+        winners = np.zeros(len(indices), dtype=np.int8)
+        done = np.zeros(len(indices), dtype=bool)
+        if len(indices) == 0:
+            return winners, done
+        boards = [GomokuBoard.from_rows(self.boards[i].tolist(), self.win_length) for i in indices]
+        moves = list(self._pool.map(self.opponent, boards, self.current_player[indices].tolist()))
+        forfeits = np.array([move is None for move in moves])
+        # An opponent that cannot move forfeits, as in the game scripts.
+        winners[forfeits] = self.agent_player
+        done[forfeits] = True
+        playing = ~forfeits
+        if playing.any():
+            cells = np.array([row * self.board_size + col for row, col in
+                              (move for move in moves if move is not None)])
+            winners[playing], done[playing] = self._place(indices[playing], cells)
+        return winners, done
+
+    def step(self, actions):
+        """
+        Plays one move per game (cell indices, shape (num_envs,)).
+
+        Returns:
+            (observations, rewards, dones, info): (num_envs, size, size) int8,
+            (num_envs,) float32 and (num_envs,) bool arrays; info holds
+            "winners" (0 for none), "legal_masks" and "final_boards".
+        """
+        indices = np.arange(self.num_envs)
+        movers = self.current_player.copy()
+        winners = np.zeros(self.num_envs, dtype=np.int8)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        # Games that ended during their reset finish now, without playing the action
+        pending = self.pending_winners >= 0
+        winners[pending] = self.pending_winners[pending]
+        dones[pending] = True
+        playing = indices[~pending]
+        if len(playing):
+            winners[playing], dones[playing] = self._place(playing, np.asarray(actions)[playing])
+
+        if self.opponent is not None:
+            answering = indices[~dones]
+            opponent_winners, opponent_done = self._opponent_moves(answering)
+            winners[answering] = opponent_winners
+            dones[answering] = opponent_done
+            me = np.full(self.num_envs, self.agent_player)
+        else:
+            me = movers
+
+        rewards = np.where(winners == 0, 0.0, np.where(winners == me, 1.0, -1.0)).astype(np.float32)
+        final_boards = self.boards[dones].copy()
+        if dones.any():
+            self.reset(indices[dones])
+        info = {"winners": winners, "legal_masks": self.legal_masks(), "final_boards": final_boards}
+        return self.boards.copy(), rewards, dones, info
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
@@ -1,12 +1,17 @@
-import time
-from gomoku_ai_player import get_ai_move, initialize_client_manually
+from gomoku_ai_player import get_ai_move, initialize_client_manually, print_latency_summary
+from gomoku_board import GomokuBoard
+from gomoku_engine import ENGINE_MODEL
+from gomoku_tactics import print_override_summary
+from gomoku_speculation import SpeculativeResponder
 
-BOARD_SIZE = 15
+BOARD_SIZE = 15  # e.g. 19 for a 19x19 board
+WIN_LENGTH = 5   # e.g. 6 for a Connect-6 style game
 MAX_MOVES_PER_PLAYER = 100
+STREAM_REPLIES = True  # Stream model replies and stop reading at the first coordinate pair
 
-board = [[0 for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+board = GomokuBoard(BOARD_SIZE, WIN_LENGTH)
 player_move_counts = {1: 0, 2: 0}
-PLAYER_MODELS = {2: "gpt-4o"}  # AI as Player 2
+PLAYER_MODELS = {2: "gpt-4o"}  # AI as Player 2, or ENGINE_MODEL for the local engine
 
 def print_board():
     print("\n" * 2)
@@ -17,7 +22,7 @@ def print_board():
     print("=============================================")
     print("   " + " ".join(f"{i:<2}" for i in range(BOARD_SIZE)))
     print("  +" + "---" * BOARD_SIZE + "+")
-    for i, row in enumerate(board):
+    for i, row in enumerate(board.rows()):
         print(f"{i:<2}|", end=" ")
         for cell in row:
             if cell == 0:
@@ -30,52 +35,38 @@ def print_board():
     print("  +" + "---" * BOARD_SIZE + "+")
 
 def check_win(player, row, col):
-    directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-    for dr, dc in directions:
-        count = 1
-        for i in range(1, 5):
-            r, c = row + dr * i, col + dc * i
-            if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-                count += 1
-            else:
-                break
-        for i in range(1, 5):
-            r, c = row - dr * i, col - dc * i
-            if 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
-                count += 1
-            else:
-                break
-        if count >= 5:
-            return True
-    return False
+    return board.check_win(player, row, col)
 
 def get_human_move():
     while True:
         try:
             move = input("Enter your move coordinates (format: row,col, e.g., 7,8): ")
             row, col = map(int, move.strip().split(","))
-            if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
-                if board[row][col] == 0:
+            if board.in_bounds(row, col):
+                if board.is_empty(row, col):
                     return row, col
                 else:
                     print("Position already occupied, please enter again.")
             else:
-                print("Coordinates out of range, please enter numbers between 0-14.")
+                print(f"Coordinates out of range, please enter numbers between 0-{BOARD_SIZE - 1}.")
         except Exception:
             print("Invalid input format, please enter in format like 7,8.")
 
 if __name__ == "__main__":
     print("--- Gomoku Human vs AI ---")
     print("You are Player 1 (X), AI is Player 2 (O)")
+    print(f"{BOARD_SIZE}x{BOARD_SIZE} board, {WIN_LENGTH} in a row wins.")
     print(f"Maximum {MAX_MOVES_PER_PLAYER} moves per player. Input format like 7,8")
     print("--------------------------")
 
-    if not initialize_client_manually():
+    if PLAYER_MODELS[2] != ENGINE_MODEL and not initialize_client_manually():
         print("Unable to initialize OpenAI client, game cannot start.")
         exit()
 
     current_player = 1
     game_over = False
+    # Precomputes AI answers to the likely human replies while input() blocks.
+    speculator = SpeculativeResponder(PLAYER_MODELS[2])
 
     while not game_over:
         print_board()
@@ -83,14 +74,18 @@ if __name__ == "__main__":
             row, col = get_human_move()
         else:
             print("AI is thinking...")
-            move = get_ai_move(board, 2, PLAYER_MODELS[2])
+            move = speculator.take(row, col)
+            if move:
+                print("(answer precomputed while you were thinking)")
+            else:
+                move = get_ai_move(board, 2, PLAYER_MODELS[2], stream=STREAM_REPLIES)
             if move:
                 row, col = move
                 print(f"AI move: {row},{col}")
             else:
                 print("AI failed to provide a valid move, game ends.")
                 break
-        board[row][col] = current_player
+        board.place(row, col, current_player)
         player_move_counts[current_player] += 1
         if check_win(current_player, row, col):
             print_board()
@@ -103,11 +98,16 @@ if __name__ == "__main__":
             print_board()
             print(f"\n*** Draw! Player {current_player} reached move limit. ***\n")
             game_over = True
-        elif sum(player_move_counts.values()) == BOARD_SIZE * BOARD_SIZE:
+        elif board.is_full():
             print_board()
             print("\n*** Draw! Board is full. ***\n")
             game_over = True
         else:
             current_player = 2 if current_player == 1 else 1
-            if current_player == 2:
-                time.sleep(1) 
\ No newline at end of file
+            if current_player == 1:
+                speculator.start(board)
+
+    speculator.print_summary()
+    speculator.shutdown()
+    print_override_summary()
+    print_latency_summary()
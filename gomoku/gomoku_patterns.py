@@ -0,0 +1,96 @@
+# gomoku_patterns.py
+
+import numpy as np
+
+from gomoku_board import WIN_LENGTH
+
+# Score of an empty cell for every line window of WIN_LENGTH cells through it
+# that holds no enemy stone, indexed by how many own stones the window has:
+# playing there makes a two, three, four or five in that window.
+WINDOW_SCORES = np.array([1, 10, 100, 1_000, 100_000], dtype=np.int64)
+# Blocking the opponent's pattern is worth slightly less than making our own.
+DEFENSE_WEIGHT = 0.8
+TOP_CANDIDATES = 10
+
+
+def _directional_windows(n, win_length):
+    """
+    Returns, for each of the four line directions, the (row, col) slices of
+    the window start region and the per-step (row, col) offsets.
+    """
+    span = n - win_length + 1
+    return [
+        ((slice(0, n), slice(0, span)), (0, 1)),
+        ((slice(0, span), slice(0, n)), (1, 0)),
+        ((slice(0, span), slice(0, span)), (1, 1)),
+        ((slice(0, span), slice(win_length - 1, n)), (1, -1)),
+    ]
+
+
+def _shifted(array, region, step, k):
+    rows, cols = region
+    return array[:, rows.start + step[0] * k:rows.stop + step[0] * k,
+                 cols.start + step[1] * k:cols.stop + step[1] * k]
+
+
+def pattern_scores(boards, player, win_length=WIN_LENGTH):
+    """
+    Scores every cell of a stack of boards for the player in one pass.
+
+    Each line window of win_length cells is convolved with a ones kernel to
+    count the player's stones in it; windows with no opponent stone add
+    WINDOW_SCORES[count] to every cell they cover.
+
+    Args:
+        boards: (N, size, size) array of 0, 1 and 2.
+
+    Returns:
+        (N, size, size) int64 array; occupied cells score 0.
+    """
+    boards = np.asarray(boards)
+    own = (boards == player).astype(np.int8)
+    enemy = (boards == 3 - player).astype(np.int8)
+    scores = np.zeros(boards.shape, dtype=np.int64)
+    for region, step in _directional_windows(boards.shape[-1], win_length):
+        own_count = sum(_shifted(own, region, step, k) for k in range(win_length))
+        enemy_count = sum(_shifted(enemy, region, step, k) for k in range(win_length))
+        # Longer win lengths score a window by how many stones it is short of a win.
+        level = np.clip(own_count - (win_length - len(WINDOW_SCORES)), 0, len(WINDOW_SCORES) - 1)
+        window = np.where(enemy_count == 0, WINDOW_SCORES[level], 0)
+        for k in range(win_length):
+            _shifted(scores, region, step, k)[...] += window
+    scores[boards != 0] = 0
+    return scores
+
+
+def cell_scores(boards, player=None, win_length=WIN_LENGTH):
+    """
+    Combined attack and defense score of every empty cell. With player=None
+    both colors are weighted equally, which ranks cells without knowing
+    whose turn it is. Occupied cells score -1.
+    """
+    boards = np.asarray(boards)
+    if player is None:
+        scores = (pattern_scores(boards, 1, win_length) + pattern_scores(boards, 2, win_length)).astype(np.float64)
+    else:
+        scores = (pattern_scores(boards, player, win_length)
+                  + DEFENSE_WEIGHT * pattern_scores(boards, 3 - player, win_length))
+    scores[boards != 0] = -1
+    return scores
+
+
+def ranked_candidates(board, player=None, limit=TOP_CANDIDATES):
+    """
+    Returns up to limit empty (row, col) cells of a GomokuBoard, best first.
+    Equal scores are ordered by distance from the centre.
+    """
+    rows = np.array(board.rows(), dtype=np.int8)[None]
+    scores = cell_scores(rows, player, board.win_length)[0].ravel()
+    index = np.arange(board.size)
+    centre = (board.size - 1) / 2
+    distance = (np.abs(index[:, None] - centre) + np.abs(index[None, :] - centre)).ravel()
+    order = np.lexsort((distance, -scores))
+    count = int((scores >= 0).sum())
+    if limit is not None:
+        count = min(limit, count)
+    return [divmod(int(cell), board.size) for cell in order[:count]]
@@ -0,0 +1,162 @@
+# gomoku_records.py
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+
+from gomoku_board import BOARD_SIZE, WIN_LENGTH
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays", "games")
+
+# Segment file (<store>.seg): records appended back to back.
+#   record header: record length, board size, win length, winner (0 = draw),
+#                  result code, move count, model name lengths, start time,
+#                  duration
+#   then: player 1 model, player 2 model (UTF-8), then the moves, one byte
+#         per move (row * size + col), or two bytes on boards over 256 cells.
+# Index file (<store>.idx): one little-endian uint64 segment offset per game.
+RECORD_HEADER = struct.Struct("<IBBBBHBBdf")
+OFFSET = struct.Struct("<Q")
+RESULT_CODES = ["five", "move_limit", "board_full", "no_move"]
+
+
+def _move_width(board_size):
+    return 1 if board_size * board_size <= 256 else 2
+
+
+def encode_game(record):
+    """Packs a game result dict (as written by the tournament) into bytes."""
+    size = record.get("board_size", BOARD_SIZE)
+    width = _move_width(size)
+    model_1 = record["player_1"].encode("utf-8")
+    model_2 = record["player_2"].encode("utf-8")
+    cells = [row * size + col for row, col in record["moves"]]
+    moves = bytes(cells) if width == 1 else struct.pack(f"<{len(cells)}H", *cells)
+    length = RECORD_HEADER.size + len(model_1) + len(model_2) + len(moves)
+    header = RECORD_HEADER.pack(
+        length, size, record.get("win_length", WIN_LENGTH), record.get("winner") or 0, RESULT_CODES.index(record["result"]),
+        len(cells), len(model_1), len(model_2),
+        record.get("started_at", 0.0), record.get("duration", 0.0),
+    )
+    return header + model_1 + model_2 + moves
+
+
+def decode_game(buffer, offset):
+    """Unpacks the game record starting at offset in buffer into a dict."""
+    (_, size, win_length, winner, result, move_count, model_1_length, model_2_length,
+     started_at, duration) = RECORD_HEADER.unpack_from(buffer, offset)
+    position = offset + RECORD_HEADER.size
+    model_1 = bytes(buffer[position:position + model_1_length]).decode("utf-8")
+    position += model_1_length
+    model_2 = bytes(buffer[position:position + model_2_length]).decode("utf-8")
+    position += model_2_length
+    if _move_width(size) == 1:
+        cells = buffer[position:position + move_count]
+    else:
+        cells = struct.unpack_from(f"<{move_count}H", buffer, position)
+    return {
+        "player_1": model_1,
+        "player_2": model_2,
+        "winner": winner or None,
+        "result": RESULT_CODES[result],
+        "moves": [divmod(cell, size) for cell in cells],
+        "board_size": size,
+        "win_length": win_length,
+        "started_at": started_at,
+        "duration": duration,
+    }
+
+
+class GameRecordWriter:
+    """Appends game records to a segment file and their offsets to an index file."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        """Stores one game and returns its index in the store."""
+        data = encode_game(record)
+        with self._lock:
+            with open(self.path + ".seg", "ab") as segment:
+                offset = segment.tell()
+                segment.write(data)
+            with open(self.path + ".idx", "ab") as index:
+                index.write(OFFSET.pack(offset))
+                return index.tell() // OFFSET.size - 1
+
+
+class ReplayStore:
+    """
+    Memory-mapped reader for a game record store.
+
+    Nothing is loaded up front: games are decoded on access, by index or by
+    iteration, straight from the mapped segment file.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._segment = self._map(path + ".seg")
+        self._index = self._map(path + ".idx")
+        self.count = len(self._index) // OFFSET.size if self._index is not None else 0
+
+    @staticmethod
+    def _map(path):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("game index out of range")
+        offset = OFFSET.unpack_from(self._index, i * OFFSET.size)[0]
+        return decode_game(self._segment, offset)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def close(self):
+        for mapped in (self._segment, self._index):
+            if mapped is not None:
+                mapped.close()
+        self._segment = self._index = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import tournament JSONL results into a binary replay store.")
+    parser.add_argument("jsonl", nargs="*", help="Tournament JSONL results files to import")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Store path without extension")
+    args = parser.parse_args()
+
+    writer = GameRecordWriter(args.store)
+    start = time.time()
+    imported = 0
+    for path in args.jsonl:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    writer.append(json.loads(line))
+                    imported += 1
+
+    store = ReplayStore(args.store)
+    size = os.path.getsize(args.store + ".seg") if len(store) else 0
+    print(f"Imported {imported} games in {time.time() - start:.1f}s.")
+    print(f"Store {args.store}: {len(store)} games, {size} bytes ({size / max(len(store), 1):.0f} bytes per game)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# gomoku_speculation.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+from gomoku_ai_player import get_ai_move
+from gomoku_engine import GomokuEngine
+from gomoku_tactics import find_forced_move, record_move
+
+# How many likely human replies to precompute an AI answer for.
+SPECULATION_WIDTH = 3
+
+
+class SpeculativeResponder:
+    """
+    Precomputes AI answers while the human is thinking.
+
+    After each AI move, `start` predicts the human's most likely replies with
+    the engine's move-ordering heuristic and asks the model for its answer to
+    each of them in a thread pool. If the human then plays one of the
+    predicted cells, `take` returns the finished (or nearly finished) answer.
+    """
+
+    def __init__(self, model_name, human=1, ai=2, width=SPECULATION_WIDTH):
+        self.model_name = model_name
+        self.human = human
+        self.ai = ai
+        self.width = width
+        self.executor = ThreadPoolExecutor(max_workers=width)
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+        self._predictor = GomokuEngine()
+
+    def start(self, board):
+        """Starts speculative AI requests for the likely human replies on this board."""
+        self.discard()
+        for row, col in self._predictor.ranked_moves(board, self.human, self.width):
+            predicted = board.copy()
+            predicted.place(row, col, self.human)
+            if predicted.check_win(self.human, row, col) or predicted.is_full():
+                continue
+            # Forced replies are answered locally in no time; don't spend a call on them.
+            if find_forced_move(predicted, self.ai):
+                continue
+            self.pending[(row, col)] = self.executor.submit(
+                get_ai_move, predicted, self.ai, self.model_name, use_tactics=False, verbose=False
+            )
+
+    def take(self, row, col):
+        """Returns the precomputed answer to the human playing (row, col), or None."""
+        future = self.pending.pop((row, col), None)
+        self.discard()
+        if future is None:
+            self.misses += 1
+            return None
+        try:
+            move = future.result()
+        except Exception as e:
+            print(f"Speculative request failed: {e}")
+            move = None
+        if move is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        record_move(None)
+        return move
+
+    def discard(self):
+        """Drops all outstanding predictions; requests already in flight finish unused."""
+        for future in self.pending.values():
+            future.cancel()
+        self.pending = {}
+
+    def shutdown(self):
+        self.discard()
+        self.executor.shutdown(wait=False)
+
+    def print_summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        print(f"Speculation: {self.hits}/{total} AI replies were precomputed ({rate:.1f}%)")
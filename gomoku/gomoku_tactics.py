@@ -0,0 +1,118 @@
+# gomoku_tactics.py
+
+import threading
+
+from gomoku_board import DIRECTIONS
+from gomoku_engine import GomokuEngine
+
+# How many moves were requested, and how many of them were answered locally.
+override_stats = {
+    "moves": 0,
+    "overrides": 0,
+    "win": 0,
+    "block_five": 0,
+    "open_four": 0,
+    "block_open_three": 0,
+}
+# Tournament games run in worker threads, so updates to override_stats are locked.
+_stats_lock = threading.Lock()
+
+# Only used for its move heuristic when several blocking cells exist.
+_scorer = GomokuEngine()
+
+
+def winning_cells(board, player, cells=None):
+    """Returns the empty cells where the player would complete a winning row."""
+    if cells is None:
+        cells = board.cells_from_mask(board.neighbour_mask(1))
+    wins = []
+    for row, col in cells:
+        if not board.is_empty(row, col):
+            continue
+        board.place(row, col, player)
+        if board.check_win(player, row, col):
+            wins.append((row, col))
+        board.remove(row, col)
+    return wins
+
+
+def _line_cells(board, row, col):
+    """Returns the cells within win_length - 1 steps of (row, col) along the four lines."""
+    cells = []
+    for dr, dc in DIRECTIONS:
+        for k in range(-(board.win_length - 1), board.win_length):
+            r, c = row + dr * k, col + dc * k
+            if k and board.in_bounds(r, c):
+                cells.append((r, c))
+    return cells
+
+
+def open_four_cells(board, player):
+    """
+    Returns the empty cells where the player would create two or more ways to
+    complete a winning row, i.e. an open four or a double four.
+    """
+    threats = []
+    for row, col in board.cells_from_mask(board.neighbour_mask(1)):
+        board.place(row, col, player)
+        if len(winning_cells(board, player, _line_cells(board, row, col))) >= 2:
+            threats.append((row, col))
+        board.remove(row, col)
+    return threats
+
+
+def _best_of(board, player, cells):
+    opponent = 3 - player
+    return max(cells, key=lambda cell: (_scorer.move_score(board, cell[0], cell[1], player)
+                                        + _scorer.move_score(board, cell[0], cell[1], opponent)))
+
+
+def find_forced_move(board, player):
+    """
+    Looks for a move the player is forced to make.
+
+    Returns:
+        ((row, col), reason) if the position has one sensible move, otherwise None.
+        The reason is one of "win", "block_five", "open_four" or "block_open_three".
+    """
+    if board.move_count == 0:
+        return None
+    board = board.copy()
+    opponent = 3 - player
+
+    wins = winning_cells(board, player)
+    if wins:
+        return wins[0], "win"
+
+    blocks = winning_cells(board, opponent)
+    if blocks:
+        return _best_of(board, player, blocks), "block_five"
+
+    fours = open_four_cells(board, player)
+    if fours:
+        return _best_of(board, player, fours), "open_four"
+
+    threats = open_four_cells(board, opponent)
+    if threats:
+        return _best_of(board, player, threats), "block_open_three"
+
+    return None
+
+
+def record_move(forced):
+    """Counts a requested move and, if it was answered locally, its reason."""
+    with _stats_lock:
+        override_stats["moves"] += 1
+        if forced is not None:
+            override_stats["overrides"] += 1
+            override_stats[forced[1]] += 1
+
+
+def print_override_summary():
+    """Prints how often the tactical override skipped the LLM."""
+    moves = override_stats["moves"]
+    overrides = override_stats["overrides"]
+    rate = overrides / moves * 100 if moves else 0
+    print(f"Tactical override: {overrides}/{moves} moves played without an LLM call ({rate:.1f}%)")
+    print(f"  win: {override_stats['win']}, block five: {override_stats['block_five']}, "
+          f"open four: {override_stats['open_four']}, block open three: {override_stats['block_open_three']}")
@@ -0,0 +1,167 @@
+# gomoku_tournament.py
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from gomoku import BOARD_SIZE, MAX_MOVES_PER_PLAYER, PLAYER_MODELS, WIN_LENGTH
+from gomoku_ai_player import get_ai_move, initialize_client_manually, print_latency_summary
+from gomoku_board import GomokuBoard
+from gomoku_engine import ENGINE_MODEL
+from gomoku_tactics import print_override_summary
+from gomoku_records import GameRecordWriter
+
+
+def play_headless_game(game_id, models, board_size=BOARD_SIZE, max_moves=MAX_MOVES_PER_PLAYER, win_length=WIN_LENGTH,
+                       **move_options):
+    """
+    Plays one game between models[1] and models[2] without printing or sleeping.
+    Every game owns its board and move counts, so games can run in parallel.
+
+    Returns:
+        dict: the result record written to the JSONL summary.
+    """
+    board = GomokuBoard(board_size, win_length)
+    move_counts = {1: 0, 2: 0}
+    moves = []
+    winner, result = None, None
+    start = time.time()
+    current_player = 1
+
+    while result is None:
+        move = get_ai_move(board, current_player, models[current_player], verbose=False, **move_options)
+        if not move:
+            winner, result = 3 - current_player, "no_move"
+            break
+        row, col = move
+        board.place(row, col, current_player)
+        move_counts[current_player] += 1
+        moves.append([row, col])
+
+        if board.check_win(current_player, row, col):
+            winner, result = current_player, "five"
+        elif move_counts[current_player] >= max_moves:
+            result = "move_limit"
+        elif board.is_full():
+            result = "board_full"
+        else:
+            current_player = 3 - current_player
+
+    return {
+        "game": game_id,
+        "player_1": models[1],
+        "player_2": models[2],
+        "winner": winner,
+        "winner_model": models[winner] if winner else None,
+        "result": result,
+        "moves": moves,
+        "board_size": board_size,
+        "win_length": win_length,
+        "started_at": start,
+        "duration": round(time.time() - start, 3),
+    }
+
+
+def parse_pairing(text):
+    """Parses 'model_1:model_2' into a {1: model_1, 2: model_2} dict."""
+    first, sep, second = text.partition(":")
+    if not sep or not first or not second:
+        raise argparse.ArgumentTypeError(f"Invalid pairing '{text}', expected 'model_1:model_2'.")
+    return {1: first, 2: second}
+
+
+def run_tournament(pairings, games_per_pairing, concurrency, output_path, swap_colors=False, record_path=None,
+                   **move_options):
+    """
+    Plays all games on a thread pool and appends each result to output_path as
+    it finishes, and to the binary replay store at record_path if given.
+    """
+    recorder = GameRecordWriter(record_path) if record_path else None
+    schedule = []
+    for models in pairings:
+        for i in range(games_per_pairing):
+            if swap_colors and i % 2 == 1:
+                schedule.append({1: models[2], 2: models[1]})
+            else:
+                schedule.append(dict(models))
+
+    write_lock = threading.Lock()
+    results = []
+    with open(output_path, "a", encoding="utf-8") as output, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(play_headless_game, game_id, models, **move_options): game_id
+                   for game_id, models in enumerate(schedule)}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:
+                print(f"Game {futures[future]} crashed: {e}")
+                continue
+            with write_lock:
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+            if recorder:
+                recorder.append(record)
+            results.append(record)
+            print(f"Game {record['game']} finished: {record['player_1']} vs {record['player_2']} -> "
+                  f"{record['winner_model'] or 'draw'} ({record['result']}, {len(record['moves'])} moves, "
+                  f"{record['duration']:.1f}s) [{len(results)}/{len(schedule)}]")
+    return results
+
+
+def print_standings(results):
+    """Prints wins, losses and draws per model."""
+    standings = {}
+    for record in results:
+        for player in (1, 2):
+            model = record[f"player_{player}"]
+            wins, losses, draws = standings.get(model, (0, 0, 0))
+            if record["winner"] is None:
+                draws += 1
+            elif record["winner"] == player:
+                wins += 1
+            else:
+                losses += 1
+            standings[model] = (wins, losses, draws)
+
+    print("\n=============================================")
+    print(f"  {'Model':<20}{'W':>6}{'L':>6}{'D':>6}")
+    print("=============================================")
+    for model, (wins, losses, draws) in sorted(standings.items(), key=lambda item: -item[1][0]):
+        print(f"  {model:<20}{wins:>6}{losses:>6}{draws:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many headless Gomoku games concurrently.")
+    parser.add_argument("--games", type=int, default=10, help="Games per pairing (default: 10)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Games played at the same time (default: 8)")
+    parser.add_argument("--pairing", action="append", type=parse_pairing,
+                        help="Model pairing as 'model_1:model_2'; repeatable (default: PLAYER_MODELS)")
+    parser.add_argument("--swap-colors", action="store_true", help="Alternate which model plays first")
+    parser.add_argument("--output", default="tournament_results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--board-size", type=int, default=BOARD_SIZE, help=f"Board size (default: {BOARD_SIZE})")
+    parser.add_argument("--win-length", type=int, default=WIN_LENGTH,
+                        help=f"Stones in a row needed to win (default: {WIN_LENGTH})")
+    parser.add_argument("--record", help="Also append every game to this binary replay store (path without extension)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream model replies, stop at the first coordinate pair and report latencies")
+    args = parser.parse_args()
+
+    pairings = args.pairing or [dict(PLAYER_MODELS)]
+    needs_client = any(model != ENGINE_MODEL for models in pairings for model in models.values())
+    if needs_client and not initialize_client_manually():
+        print("Could not start the tournament due to API key issue.")
+        return
+
+    start = time.time()
+    results = run_tournament(pairings, args.games, args.concurrency, args.output, args.swap_colors, args.record,
+                             board_size=args.board_size, win_length=args.win_length, stream=args.stream)
+    print_standings(results)
+    print(f"\n{len(results)} games in {time.time() - start:.1f}s, results appended to {args.output}")
+    print_override_summary()
+    print_latency_summary()
+
+
+if __name__ == "__main__":
+    main()
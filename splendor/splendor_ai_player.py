@@ -109,22 +109,37 @@ def get_ai_move(board, player, model_name):
     print("AI failed to provide a valid move after 3 attempts.")
     return None
 
-def get_ai_action(game_state, player, model_name):
-    """Generate an action for the AI player in Splendor."""
+def get_ai_action(game_state, player, model_name, legal_actions=None):
+    """
+    Generate an action for the AI player in Splendor.
+
+    If legal_actions (a list of action descriptions) is given, the model is
+    asked to pick one by number and answers 'Action: <number>'.
+    """
     if not client:
         print("OpenAI client is not initialized.")
         if not initialize_client_manually():
             return None
 
-    prompt = (
-        f"You are an expert Splendor player. The current game state is as follows:\n"
-        f"{game_state}\n"
-        "You can choose one of the following actions:\n"
-        "1. Take gems (specify which gems).\n"
-        "2. Reserve a card (specify which card).\n"
-        "3. Buy a card (specify which card).\n"
-        "Respond with your action in the format: 'Action: [details]'."
-    )
+    if legal_actions:
+        options = "\n".join(f"{i}. {action}" for i, action in enumerate(legal_actions, 1))
+        prompt = (
+            f"You are an expert Splendor player, playing as {player}. The current game state is as follows:\n"
+            f"{game_state}\n"
+            "Your legal actions are:\n"
+            f"{options}\n"
+            "Respond with the number of your chosen action in the format: 'Action: [number]'."
+        )
+    else:
+        prompt = (
+            f"You are an expert Splendor player. The current game state is as follows:\n"
+            f"{game_state}\n"
+            "You can choose one of the following actions:\n"
+            "1. Take gems (specify which gems).\n"
+            "2. Reserve a card (specify which card).\n"
+            "3. Buy a card (specify which card).\n"
+            "Respond with your action in the format: 'Action: [details]'."
+        )
 
     for attempt in range(3):  # Retry up to 3 times
         if attempt == 0:
@@ -0,0 +1,149 @@
+# splendor_cards.py
+
+import numpy as np
+
+# Token colors in array order; the first five are also card bonus colors.
+GEM_TYPES = ["Diamond", "Sapphire", "Emerald", "Ruby", "Onyx", "Gold"]
+COLORS = 5
+GOLD = 5
+
+# The 90 development cards, one per line:
+#   level, bonus color (w=Diamond u=Sapphire g=Emerald r=Ruby k=Onyx), points,
+#   then the cost in Diamond, Sapphire, Emerald, Ruby, Onyx.
+CARD_TABLE = """
+1 k 0 1 1 1 1 0
+1 k 0 1 2 1 1 0
+1 k 0 2 2 0 1 0
+1 k 0 0 0 1 3 1
+1 k 0 0 0 2 1 0
+1 k 0 2 0 2 0 0
+1 k 0 0 0 3 0 0
+1 k 1 0 4 0 0 0
+1 u 0 1 0 1 1 1
+1 u 0 1 0 1 2 1
+1 u 0 1 0 2 2 0
+1 u 0 0 1 3 1 0
+1 u 0 1 0 0 0 2
+1 u 0 0 0 2 0 2
+1 u 0 0 0 0 0 3
+1 u 1 0 0 0 4 0
+1 w 0 0 1 1 1 1
+1 w 0 0 1 2 1 1
+1 w 0 0 2 2 0 1
+1 w 0 3 1 0 0 1
+1 w 0 0 0 0 2 1
+1 w 0 0 2 0 0 2
+1 w 0 0 3 0 0 0
+1 w 1 0 0 4 0 0
+1 g 0 1 1 0 1 1
+1 g 0 1 1 0 1 2
+1 g 0 0 1 0 2 2
+1 g 0 1 3 1 0 0
+1 g 0 2 1 0 0 0
+1 g 0 0 2 0 2 0
+1 g 0 0 0 0 3 0
+1 g 1 0 0 0 0 4
+1 r 0 1 1 1 0 1
+1 r 0 2 1 1 0 1
+1 r 0 2 0 1 0 2
+1 r 0 1 0 0 1 3
+1 r 0 0 2 1 0 0
+1 r 0 2 0 0 2 0
+1 r 0 3 0 0 0 0
+1 r 1 4 0 0 0 0
+2 k 1 3 2 2 0 0
+2 k 1 3 0 3 0 2
+2 k 2 0 1 4 2 0
+2 k 2 0 0 5 3 0
+2 k 2 5 0 0 0 0
+2 k 3 0 0 0 0 6
+2 u 1 0 2 2 3 0
+2 u 1 0 2 3 0 3
+2 u 2 5 3 0 0 0
+2 u 2 2 0 0 1 4
+2 u 2 0 5 0 0 0
+2 u 3 0 6 0 0 0
+2 w 1 0 0 3 2 2
+2 w 1 2 3 0 3 0
+2 w 2 0 0 1 4 2
+2 w 2 0 0 0 5 3
+2 w 2 0 0 0 5 0
+2 w 3 6 0 0 0 0
+2 g 1 3 0 2 3 0
+2 g 1 2 3 0 0 2
+2 g 2 4 2 0 0 1
+2 g 2 0 5 3 0 0
+2 g 2 0 0 5 0 0
+2 g 3 0 0 6 0 0
+2 r 1 2 0 0 2 3
+2 r 1 0 3 0 2 3
+2 r 2 1 4 2 0 0
+2 r 2 3 0 0 0 5
+2 r 2 0 0 0 0 5
+2 r 3 0 0 0 6 0
+3 k 3 3 3 5 3 0
+3 k 4 0 0 0 7 0
+3 k 4 0 0 3 6 3
+3 k 5 0 0 0 7 3
+3 u 3 3 0 3 3 5
+3 u 4 7 0 0 0 0
+3 u 4 6 3 0 0 3
+3 u 5 7 3 0 0 0
+3 w 3 0 3 3 5 3
+3 w 4 0 0 0 0 7
+3 w 4 3 0 0 3 6
+3 w 5 3 0 0 0 7
+3 g 3 5 3 0 3 3
+3 g 4 0 7 0 0 0
+3 g 4 3 6 3 0 0
+3 g 5 0 7 3 0 0
+3 r 3 3 5 3 0 3
+3 r 4 0 0 7 0 0
+3 r 4 0 3 6 3 0
+3 r 5 0 0 7 3 0
+"""
+
+# The 10 nobles, worth 3 points each; requirements in card bonuses per color.
+NOBLE_TABLE = """
+4 4 0 0 0
+4 0 0 0 4
+0 4 4 0 0
+0 0 4 4 0
+0 0 0 4 4
+3 3 0 0 3
+3 3 3 0 0
+0 3 3 3 0
+0 0 3 3 3
+3 0 0 3 3
+"""
+NOBLE_POINTS = 3
+
+BONUS_CODES = "wugrk"
+
+def _parse_cards(table):
+    rows = [line.split() for line in table.strip().splitlines()]
+    level = np.array([int(row[0]) for row in rows], dtype=np.int8)
+    bonus = np.array([BONUS_CODES.index(row[1]) for row in rows], dtype=np.int8)
+    points = np.array([int(row[2]) for row in rows], dtype=np.int8)
+    cost = np.array([[int(value) for value in row[3:]] for row in rows], dtype=np.int8)
+    return level, bonus, points, cost
+
+# Card id i is row i of the table; ids are grouped by level.
+CARD_LEVEL, CARD_BONUS, CARD_POINTS, CARD_COST = _parse_cards(CARD_TABLE)
+NOBLE_REQUIREMENTS = np.array([[int(value) for value in line.split()]
+                               for line in NOBLE_TABLE.strip().splitlines()], dtype=np.int8)
+
+LEVELS = 3
+# First card id and number of cards of each level
+LEVEL_START = tuple(int(np.argmax(CARD_LEVEL == level)) for level in range(1, LEVELS + 1))
+LEVEL_SIZE = tuple(int((CARD_LEVEL == level).sum()) for level in range(1, LEVELS + 1))
+
+def card_to_string(card):
+    """e.g. 'L2 Ruby +2 (Diamond 3, Onyx 5)'"""
+    cost = ", ".join(f"{GEM_TYPES[color]} {CARD_COST[card, color]}" for color in range(COLORS) if CARD_COST[card, color])
+    return f"L{CARD_LEVEL[card]} {GEM_TYPES[CARD_BONUS[card]]} +{CARD_POINTS[card]} ({cost})"
+
+def noble_to_string(noble):
+    needs = ", ".join(f"{GEM_TYPES[color]} {NOBLE_REQUIREMENTS[noble, color]}"
+                      for color in range(COLORS) if NOBLE_REQUIREMENTS[noble, color])
+    return f"Noble +{NOBLE_POINTS} ({needs})"
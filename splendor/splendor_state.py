@@ -0,0 +1,262 @@
+# splendor_state.py
+
+import random
+from itertools import combinations
+
+import numpy as np
+
+from splendor_cards import (
+    CARD_BONUS, CARD_COST, CARD_POINTS, COLORS, GOLD, LEVEL_SIZE, LEVEL_START, LEVELS, NOBLE_POINTS,
+    NOBLE_REQUIREMENTS,
+)
+
+MARKET_SIZE = 4          # face-up cards per level
+MAX_RESERVED = 3
+MAX_TOKENS = 10
+WINNING_POINTS = 15
+GOLD_TOKENS = 5
+GEMS_PER_COLOR = {2: 4, 3: 5, 4: 7}
+NUM_CARDS = len(CARD_POINTS)
+NUM_NOBLES = len(NOBLE_REQUIREMENTS)
+EMPTY = -1
+
+# Noble slots: EMPTY (not dealt), AVAILABLE, or the index of the player it visited
+AVAILABLE = -2
+
+# Actions are small tuples:
+#   ("take", (color, color, color))  three different gems (fewer if the bank runs low)
+#   ("take2", color)                 two gems of one color, from a pile of at least 4
+#   ("reserve", card)                a face-up card, plus a gold token if any is left
+#   ("reserve_deck", level)          the top card of a deck, unseen
+#   ("buy", card)                    a face-up or reserved card
+#   ("pass",)                        only when nothing else is legal
+
+
+class SplendorState:
+    """
+    Complete Splendor game state in one fixed-size int16 array.
+
+    The named fields (bank, gems, bonuses, ...) are numpy views into
+    self.data, so copying a state is one array copy, comparing two states is
+    one array comparison, and data.tobytes() is a hashable key.
+
+    Layout, with P players:
+        bank (6)          tokens left per color, gold last
+        gems (P x 6)      tokens held per player
+        bonuses (P x 5)   purchased card bonuses per player
+        points (P)
+        purchased (P)     cards bought, the tiebreak
+        reserved (P x 3)  reserved card ids, EMPTY when free
+        market (3 x 4)    face-up card ids per level, EMPTY when the deck ran out
+        decks (90)        shuffled card ids, level by level
+        deck_top (3)      cards already drawn from each level's deck
+        nobles (10)       EMPTY, AVAILABLE or the player a noble visited
+        meta (3)          player to move, turns played, final round flag
+    """
+
+    def __init__(self, num_players, data=None):
+        if num_players not in GEMS_PER_COLOR:
+            raise ValueError("Invalid number of players. Must be 2, 3, or 4.")
+        self.num_players = num_players
+        shapes = [("bank", (COLORS + 1,)), ("gems", (num_players, COLORS + 1)), ("bonuses", (num_players, COLORS)),
+                  ("points", (num_players,)), ("purchased", (num_players,)), ("reserved", (num_players, MAX_RESERVED)),
+                  ("market", (LEVELS, MARKET_SIZE)), ("decks", (NUM_CARDS,)), ("deck_top", (LEVELS,)),
+                  ("nobles", (NUM_NOBLES,)), ("meta", (3,))]
+        size = sum(int(np.prod(shape)) for _, shape in shapes)
+        self.data = np.zeros(size, dtype=np.int16) if data is None else data
+        offset = 0
+        for name, shape in shapes:
+            length = int(np.prod(shape))
+            setattr(self, name, self.data[offset:offset + length].reshape(shape))
+            offset += length
+
+    @classmethod
+    def new_game(cls, num_players, rng=None):
+        """Deals a new game: shuffled decks, four face-up cards per level and players + 1 nobles."""
+        rng = rng or random.Random()
+        state = cls(num_players)
+        state.bank[:COLORS] = GEMS_PER_COLOR[num_players]
+        state.bank[GOLD] = GOLD_TOKENS
+        state.reserved[:] = EMPTY
+        for level in range(LEVELS):
+            cards = list(range(LEVEL_START[level], LEVEL_START[level] + LEVEL_SIZE[level]))
+            rng.shuffle(cards)
+            state.decks[LEVEL_START[level]:LEVEL_START[level] + LEVEL_SIZE[level]] = cards
+            for slot in range(MARKET_SIZE):
+                state.market[level, slot] = state.draw(level)
+        state.nobles[:] = EMPTY
+        state.nobles[rng.sample(range(NUM_NOBLES), num_players + 1)] = AVAILABLE
+        return state
+
+    def copy(self):
+        return SplendorState(self.num_players, self.data.copy())
+
+    def __eq__(self, other):
+        return isinstance(other, SplendorState) and np.array_equal(self.data, other.data)
+
+    def __hash__(self):
+        return hash(self.data.tobytes())
+
+    @property
+    def current_player(self):
+        return int(self.meta[0])
+
+    @property
+    def turns(self):
+        return int(self.meta[1])
+
+    def draw(self, level):
+        """Takes the top card of a level's deck; EMPTY when the deck is exhausted."""
+        if self.deck_top[level] >= LEVEL_SIZE[level]:
+            return EMPTY
+        card = int(self.decks[LEVEL_START[level] + self.deck_top[level]])
+        self.deck_top[level] += 1
+        return card
+
+    def deck_remaining(self, level):
+        return LEVEL_SIZE[level] - int(self.deck_top[level])
+
+    def market_cards(self):
+        return [int(card) for card in self.market.ravel() if card != EMPTY]
+
+    def reserved_cards(self, player):
+        return [int(card) for card in self.reserved[player] if card != EMPTY]
+
+    def payment(self, player, card):
+        """
+        Returns the tokens (length-6 vector) player would pay for card, or
+        None if they cannot afford it. Bonuses reduce the cost; gold covers
+        any remaining shortfall.
+        """
+        need = np.maximum(CARD_COST[card] - self.bonuses[player], 0)
+        colored = np.minimum(need, self.gems[player, :COLORS])
+        gold = int((need - colored).sum())
+        if gold > self.gems[player, GOLD]:
+            return None
+        return np.append(colored, gold).astype(np.int16)
+
+    def legal_actions(self):
+        player = self.current_player
+        actions = []
+        available = [color for color in range(COLORS) if self.bank[color] > 0]
+        if len(available) >= 3:
+            actions.extend(("take", colors) for colors in combinations(available, 3))
+        elif available:
+            actions.append(("take", tuple(available)))
+        actions.extend(("take2", color) for color in range(COLORS) if self.bank[color] >= 4)
+        if len(self.reserved_cards(player)) < MAX_RESERVED:
+            actions.extend(("reserve", card) for card in self.market_cards())
+            actions.extend(("reserve_deck", level) for level in range(LEVELS) if self.deck_remaining(level))
+        actions.extend(("buy", card) for card in self.market_cards() + self.reserved_cards(player)
+                       if self.payment(player, card) is not None)
+        return actions or [("pass",)]
+
+    def apply(self, action):
+        """Plays action for the player to move, then handles tokens over 10, nobles and the turn order."""
+        player = self.current_player
+        kind = action[0]
+        if kind == "take":
+            colors = action[1]
+            if not 1 <= len(colors) <= 3 or len(set(colors)) != len(colors):
+                raise ValueError(f"Gems taken one at a time must be 1 to 3 different colors: {colors}")
+            if any(not 0 <= color < COLORS or self.bank[color] < 1 for color in colors):
+                raise ValueError(f"Cannot take gems {colors} from the bank.")
+            for color in colors:
+                self._move_tokens(player, color, 1)
+        elif kind == "take2":
+            self._move_tokens(player, action[1], 2)
+        elif kind == "reserve":
+            self._check_reserve_slot(player)
+            if action[1] not in self.market_cards():
+                raise ValueError(f"Card {action[1]} is not on the table.")
+            self._take_from_market(action[1])
+            self._reserve(player, action[1])
+        elif kind == "reserve_deck":
+            self._check_reserve_slot(player)
+            if not self.deck_remaining(action[1]):
+                raise ValueError(f"The level {action[1] + 1} deck is empty.")
+            self._reserve(player, self.draw(action[1]))
+        elif kind == "buy":
+            self._buy(player, action[1])
+        elif kind != "pass":
+            raise ValueError(f"Unknown action: {action}")
+
+        self._return_excess_tokens(player)
+        self._visit_noble(player)
+        if self.points[player] >= WINNING_POINTS:
+            self.meta[2] = 1
+        self.meta[0] = (player + 1) % self.num_players
+        self.meta[1] += 1
+
+    def _move_tokens(self, player, color, count):
+        if not 0 <= color < COLORS or self.bank[color] < count:
+            raise ValueError(f"Cannot take {count} gem(s) of color {color}.")
+        if count == 2 and self.bank[color] < 4:
+            raise ValueError("Two gems of one color can only be taken from a pile of at least 4.")
+        self.bank[color] -= count
+        self.gems[player, color] += count
+
+    def _take_from_market(self, card):
+        """Removes a face-up card and refills its slot from the deck of the same level."""
+        position = np.flatnonzero(self.market.ravel() == card)
+        if len(position) == 0:
+            return False
+        level, slot = divmod(int(position[0]), MARKET_SIZE)
+        self.market[level, slot] = self.draw(level)
+        return True
+
+    def _check_reserve_slot(self, player):
+        if not (self.reserved[player] == EMPTY).any():
+            raise ValueError(f"Player {player} cannot reserve more than {MAX_RESERVED} cards.")
+
+    def _reserve(self, player, card):
+        """Puts card in the player's first free reserve slot (checked by the caller) and hands out gold."""
+        free = np.flatnonzero(self.reserved[player] == EMPTY)
+        self.reserved[player, free[0]] = card
+        if self.bank[GOLD] > 0:
+            self.bank[GOLD] -= 1
+            self.gems[player, GOLD] += 1
+
+    def _buy(self, player, card):
+        cost = self.payment(player, card)
+        if cost is None:
+            raise ValueError(f"Player {player} cannot afford card {card}.")
+        held = np.flatnonzero(self.reserved[player] == card)
+        if len(held):
+            self.reserved[player, held[0]] = EMPTY
+        elif not self._take_from_market(card):
+            raise ValueError(f"Card {card} is neither on the table nor reserved.")
+        self.gems[player] -= cost
+        self.bank += cost
+        self.bonuses[player, CARD_BONUS[card]] += 1
+        self.points[player] += CARD_POINTS[card]
+        self.purchased[player] += 1
+
+    def _return_excess_tokens(self, player):
+        """Returns tokens over the limit, from the colors held most (gold last)."""
+        while self.gems[player].sum() > MAX_TOKENS:
+            colored = self.gems[player, :COLORS]
+            color = int(np.argmax(colored)) if colored.any() else GOLD
+            self.gems[player, color] -= 1
+            self.bank[color] += 1
+
+    def _visit_noble(self, player):
+        """At most one noble visits per turn, the first one whose requirements are met."""
+        for noble in np.flatnonzero(self.nobles == AVAILABLE):
+            if (self.bonuses[player] >= NOBLE_REQUIREMENTS[noble]).all():
+                self.nobles[noble] = player
+                self.points[player] += NOBLE_POINTS
+                return int(noble)
+        return None
+
+    def is_over(self):
+        """The game ends once someone reached 15 points and the round is complete."""
+        return bool(self.meta[2]) and self.current_player == 0
+
+    def winner(self):
+        """Most points wins; ties go to the player who bought fewer cards. None on a full tie."""
+        ranking = sorted(range(self.num_players), key=lambda p: (-int(self.points[p]), int(self.purchased[p])))
+        best, runner_up = ranking[0], ranking[1]
+        if (self.points[best], self.purchased[best]) == (self.points[runner_up], self.purchased[runner_up]):
+            return None
+        return best
@@ -1,8 +1,13 @@
 import os
 import re
+import time
 import getpass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from openai import OpenAI
 from dotenv import load_dotenv
+from idiom_lexicon import is_known_idiom
+from local_player import LOCAL_MODEL, get_local_idiom
+from idiom_pinyin import DEFAULT_CHAIN_MODE, default_pinyin_table
 
 # Load environment variables from .env file
 load_dotenv()
@@ -39,66 +44,264 @@ def initialize_client_manually():
         print(f"Error initializing OpenAI client manually: {e}")
         return False
 
-def get_ai_idiom(game_history, current_idiom, ai_model="gpt-4o", max_retries=3):
+IDIOM_RULES = """你正在玩成语接龙游戏，规则如下：
+1. 你必须提供一个四字成语
+2. {chain_rule}
+3. 你的成语不能与之前使用过的成语重复
+4. 必须是真实存在的中文成语
+"""
+
+# Rule 2 of the prompt for each chain mode (see idiom_pinyin.CHAIN_MODES)
+CHAIN_RULES = {
+    "exact": "你的成语的第一个字必须与上一个成语的最后一个字完全相同",
+    "homophone": "你的成语的第一个字必须与上一个成语的最后一个字同音（拼音和声调都相同），可以是不同的字",
+    "pinyin": "你的成语的第一个字必须与上一个成语的最后一个字拼音相同（声调不限），可以是不同的字",
+}
+
+# Number of most recent idioms shown in the prompt; None sends the full history
+HISTORY_WINDOW = 8
+
+def build_idiom_prompt(game_history, current_idiom, used_idioms, history_window=HISTORY_WINDOW,
+                       chain_mode=DEFAULT_CHAIN_MODE):
+    """
+    Build the user prompt for one idiom turn
+
+    With a history window, only the last history_window idioms are shown,
+    plus the used idioms that start with the required character -- the only
+    ones the model could repeat -- so the prompt stays bounded however long
+    the game runs. With history_window=None the full history is sent.
+    In the homophone modes the pinyin of the last character (as read in
+    current_idiom) is spelled out.
+    """
+    rules = IDIOM_RULES.format(chain_rule=CHAIN_RULES[chain_mode])
+    required_char = current_idiom[-1]
+    table = default_pinyin_table()
+    reading = table.edge_readings(current_idiom)[1]
+    if chain_mode != "exact" and reading:
+        rules += f"\n当前成语的最后一个字 '{required_char}' 读作 {reading}\n"
+    if history_window is None:
+        history_text = " -> ".join(game_history) if game_history else "无"
+        used_text = ', '.join(game_history)
+        return f"""{rules}
+游戏历史: {history_text}
+当前成语: {current_idiom}
+
+已使用的成语: {used_text}
+
+请只回答下一个成语，不要任何解释。
+"""
+
+    recent = game_history[-history_window:] if history_window > 0 else []
+    recent_text = " -> ".join(recent) if recent else "无"
+    required_key = table.last_key(current_idiom, chain_mode)
+    blocked = sorted(idiom for idiom in used_idioms if table.first_key(idiom, chain_mode) == required_key)
+    blocked_text = ', '.join(blocked) if blocked else "无"
+    blocked_label = f'以"{required_char}"开头的成语' if chain_mode == "exact" else "可以接上的成语"
+    return f"""{rules}
+最近的成语 (共 {len(game_history)} 个): {recent_text}
+当前成语: {current_idiom}
+
+已使用过的{blocked_label}: {blocked_text}
+
+请只回答下一个成语，不要任何解释。
+"""
+
+# Seconds to wait for the first reply before a hedged request is sent
+HEDGE_DELAY = 1.5
+
+_hedge_pool = None
+
+# model -> list of (time to first token, time to answer) in seconds, for streamed requests
+latency_stats = {}
+
+def _strip_quotes(text):
+    return text.strip().strip('"\'“”「」')
+
+def _idiom_seen(text):
+    """Check whether a partial reply already holds four characters after any quotes"""
+    return len(_strip_quotes(text)) >= 4
+
+def _request_idiom(ai_model, prompt, stream=False):
+    """
+    Send one idiom request and return the raw reply text
+    
+    With stream, the reply is read token by token and the stream is closed as
+    soon as four characters have arrived; time to first token and time to
+    answer are recorded in latency_stats.
+    """
+    messages = [
+        {"role": "system", "content": "你是一个成语专家，精通中文成语接龙游戏。只提供所需的成语，不要额外解释。"},
+        {"role": "user", "content": prompt}
+    ]
+    if not stream:
+        response = client.chat.completions.create(
+            model=ai_model,
+            messages=messages,
+            max_tokens=20,
+            temperature=0.7
+        )
+        return response.choices[0].message.content.strip()
+    
+    start = time.perf_counter()
+    first_token = None
+    text = ""
+    response = client.chat.completions.create(
+        model=ai_model,
+        messages=messages,
+        max_tokens=20,
+        temperature=0.7,
+        stream=True
+    )
+    try:
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            text += delta
+            if _idiom_seen(text):
+                break
+    finally:
+        response.close()
+    answer = time.perf_counter() - start
+    latency_stats.setdefault(ai_model, []).append((first_token if first_token is not None else answer, answer))
+    return _strip_quotes(text)[:4] if _idiom_seen(text) else text.strip()
+
+def print_latency_summary():
+    """Print the mean time to first token and time to answer of streamed requests per model"""
+    for model, samples in latency_stats.items():
+        first_token = sum(sample[0] for sample in samples) / len(samples)
+        answer = sum(sample[1] for sample in samples) / len(samples)
+        print(f"⏱️ {model} 流式请求 {len(samples)} 次: 首个token {first_token:.2f}s, 得到答案 {answer:.2f}s")
+
+def check_ai_idiom(ai_idiom, used_idioms, current_idiom=None, chain_mode=DEFAULT_CHAIN_MODE):
+    """
+    Validate a raw AI reply locally
+    
+    Returns:
+        (idiom, None) if the reply is usable, otherwise (None, reason)
+    """
+    # Basic validation for Chinese idiom
+    if not (ai_idiom and len(ai_idiom) == 4 and all('\u4e00' <= char <= '\u9fff' for char in ai_idiom)):
+        return None, f"AI回应不是四字成语: {ai_idiom}"
+    # Remove quotes if present
+    ai_idiom = ai_idiom.strip('"\'')
+    # Reject idioms that are not in the lexicon before the turn counts
+    if not is_known_idiom(ai_idiom):
+        return None, f"AI回应不是词典中的成语: {ai_idiom}"
+    if current_idiom is not None and not validate_idiom_chain(current_idiom, ai_idiom, chain_mode):
+        return None, f"AI回应不符合接龙规则: {ai_idiom}"
+    # Check if idiom is already used
+    if ai_idiom in used_idioms:
+        return None, f"AI选择了重复的成语: {ai_idiom}"
+    return ai_idiom, None
+
+def _hedged_request(prompt, current_idiom, used_idioms, ai_model, hedge_model, hedge_delay, stream=False,
+                    replies=None, chain_mode=DEFAULT_CHAIN_MODE):
+    """
+    Race a request to ai_model against a hedged one to hedge_model
+    
+    The hedge is sent after hedge_delay seconds, or as soon as the first
+    reply fails validation. The first reply that passes check_ai_idiom
+    (including the chain rule) wins; the other request is cancelled if it has
+    not started, or left to finish unused.
+    
+    Returns:
+        (idiom, reasons): the winning idiom or None, and the rejection reasons
+    """
+    global _hedge_pool
+    if _hedge_pool is None:
+        _hedge_pool = ThreadPoolExecutor(max_workers=4)
+    
+    def attempt(model):
+        return model, _request_idiom(model, prompt, stream)
+    
+    pending = {_hedge_pool.submit(attempt, ai_model)}
+    hedged = False
+    reasons = []
+    try:
+        while pending:
+            timeout = hedge_delay if not hedged else None
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    model, reply = future.result()
+                except Exception as e:
+                    reasons.append(f"获取AI回应时出错: {e}")
+                    continue
+                if replies is not None:
+                    replies.append((model, reply))
+                idiom, reason = check_ai_idiom(reply, used_idioms, current_idiom, chain_mode)
+                if idiom:
+                    if hedged:
+                        print(f"对冲请求中 {model} 先给出有效成语.")
+                    return idiom, reasons
+                reasons.append(f"{reason} ({model})")
+            if not hedged:
+                hedged = True
+                pending.add(_hedge_pool.submit(attempt, hedge_model))
+        return None, reasons
+    finally:
+        for future in pending:
+            future.cancel()
+
+def get_ai_idiom(game_history, current_idiom, ai_model="gpt-4o", max_retries=3, fallback_to_local=True,
+                 used_idioms=None, history_window=HISTORY_WINDOW, hedge_model=None, hedge_delay=HEDGE_DELAY,
+                 stream=False, replies=None, chain_mode=DEFAULT_CHAIN_MODE):
     """
     Get AI's next Chinese idiom for idiom chain game
     
     Args:
         game_history: List of previous idioms in the game
         current_idiom: The last idiom that AI needs to respond to
-        ai_model: AI model to use
+        ai_model: AI model to use, or LOCAL_MODEL for the local player
         max_retries: Maximum retry attempts
+        fallback_to_local: Let the local player answer when the AI fails
+        used_idioms: Set of idioms already played (built from game_history if omitted)
+        history_window: Recent idioms to show in the prompt; None sends the full history
+        hedge_model: Model for a hedged second request (e.g. ai_model itself or a
+            cheaper one); None sends one request at a time
+        hedge_delay: Seconds to wait before sending the hedged request (0 sends both at once)
+        stream: Stream replies and stop reading once four characters have arrived
+        replies: Optional list that every raw (model, reply) pair is appended to, for game logs
+        chain_mode: "exact", "homophone" or "pinyin" (see idiom_pinyin.CHAIN_MODES)
     
     Returns:
         String: AI's chosen idiom, or None if failed
     """
+    if ai_model == LOCAL_MODEL:
+        return get_local_idiom(game_history, current_idiom, chain_mode=chain_mode)
+    
     if not client:
         print("OpenAI client not initialized.")
+        if fallback_to_local:
+            print("改用本地成语接龙引擎.")
+            return get_local_idiom(game_history, current_idiom, chain_mode=chain_mode)
         return None
     
-    # Create the prompt for Chinese idiom chain
-    history_text = " -> ".join(game_history) if game_history else "无"
-    
-    prompt = f"""你正在玩成语接龙游戏，规则如下：
-1. 你必须提供一个四字成语
-2. 你的成语的第一个字必须与上一个成语的最后一个字完全相同
-3. 你的成语不能与之前使用过的成语重复
-4. 必须是真实存在的中文成语
-
-游戏历史: {history_text}
-当前成语: {current_idiom}
-
-已使用的成语: {', '.join(game_history)}
-
-请只回答下一个成语，不要任何解释。
-"""
+    if used_idioms is None:
+        used_idioms = set(game_history)
+    prompt = build_idiom_prompt(game_history, current_idiom, used_idioms, history_window, chain_mode)
 
     for attempt in range(max_retries):
+        if hedge_model:
+            idiom, reasons = _hedged_request(prompt, current_idiom, used_idioms, ai_model, hedge_model, hedge_delay,
+                                             stream, replies, chain_mode)
+            if idiom:
+                return idiom
+            for reason in reasons:
+                print(f"{reason}. 重试中...")
+            continue
+        
         try:
-            response = client.chat.completions.create(
-                model=ai_model,
-                messages=[
-                    {"role": "system", "content": "你是一个成语专家，精通中文成语接龙游戏。只提供所需的成语，不要额外解释。"},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=20,
-                temperature=0.7
-            )
-            
-            ai_idiom = response.choices[0].message.content.strip()
-            
-            # Basic validation for Chinese idiom
-            if ai_idiom and len(ai_idiom) == 4 and all('\u4e00' <= char <= '\u9fff' for char in ai_idiom):
-                # Remove quotes if present
-                ai_idiom = ai_idiom.strip('"\'')
-                
-                # Check if idiom is already used
-                if ai_idiom not in game_history:
-                    return ai_idiom
-                else:
-                    print(f"AI选择了重复的成语: {ai_idiom}. 重试中...")
-            else:
-                print(f"AI回应不是四字成语: {ai_idiom}. 重试中...")
+            reply = _request_idiom(ai_model, prompt, stream)
+            if replies is not None:
+                replies.append((ai_model, reply))
+            idiom, reason = check_ai_idiom(reply, used_idioms, current_idiom, chain_mode)
+            if idiom:
+                return idiom
+            print(f"{reason}. 重试中...")
                 
         except Exception as e:
             print(f"获取AI回应时出错 (第 {attempt + 1} 次尝试): {e}")
@@ -107,15 +310,20 @@ def get_ai_idiom(game_history, current_idiom, ai_model="gpt-4o", max_retries=3):
             else:
                 print("已达到最大重试次数.")
     
+    if fallback_to_local:
+        print("AI未能给出有效成语, 改用本地成语接龙引擎.")
+        return get_local_idiom(game_history, current_idiom, chain_mode=chain_mode)
     return None
 
-def validate_idiom_chain(previous_idiom, current_idiom):
+def validate_idiom_chain(previous_idiom, current_idiom, chain_mode=DEFAULT_CHAIN_MODE):
     """
     Validate if current idiom follows the idiom chain rule
     
     Args:
         previous_idiom: The previous idiom in the chain
         current_idiom: The current idiom to validate
+        chain_mode: "exact" for the same character, "homophone" for the same
+            pinyin and tone, "pinyin" for the same pinyin in any tone
     
     Returns:
         bool: True if valid, False otherwise
@@ -132,4 +340,9 @@ def validate_idiom_chain(previous_idiom, current_idiom):
         return False
     
     # Check if last character of previous matches first character of current
-    return previous_idiom[-1] == current_idiom[0]
+    if chain_mode == "exact":
+        return previous_idiom[-1] == current_idiom[0]
+    # Homophone modes compare precomputed pinyin keys, using the reading each
+    # character has in its own idiom: a few dict lookups
+    table = default_pinyin_table()
+    return table.last_key(previous_idiom, chain_mode) == table.first_key(current_idiom, chain_mode)
@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import argparse
+from collections import Counter
+
+import numpy as np
+
+from idiom_lexicon import default_lexicon, is_four_hanzi
+from idiom_pinyin import CHAIN_MODES, default_pinyin_table
+
+# AI vs AI games are appended here, one JSON object per line:
+#   {"player_1", "player_2": model names, "chain_mode", "start": starting idiom,
+#    "moves": [{"player": 1 or 2, "idiom": accepted idiom or null,
+#               "replies": [[model, raw reply], ...]}, ...],
+#    "result": "max_rounds" | "no_idiom" | "invalid" | "repeat",
+#    "loser": 1, 2 or null, "started_at", "duration"}
+# The last move of a lost game holds the idiom that was rejected.
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_logs.jsonl")
+
+def append_game_log(record, path=DEFAULT_LOG_PATH):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def load_game_logs(paths):
+    games = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            games.extend(json.loads(line) for line in f if line.strip())
+    return games
+
+def _codes(values, vocabulary):
+    """Map strings to their index in the sorted, non-empty vocabulary array, -1 if absent"""
+    values = np.array(values, dtype=vocabulary.dtype).reshape(-1)
+    index = np.minimum(np.searchsorted(vocabulary, values), len(vocabulary) - 1)
+    return np.where(vocabulary[index] == values, index, -1)
+
+def analyze_game_logs(games, lexicon=None):
+    """
+    Check every recorded reply and move against the lexicon and chain rule
+
+    The games are flattened into parallel arrays once; membership, chain and
+    repeat checks are then whole-array operations (sorted lookups, unique
+    keys and bincounts) rather than per-pair validate_idiom_chain calls.
+
+    Returns:
+        dict: per-model statistics and lexicon coverage
+    """
+    if lexicon is None:
+        lexicon = default_lexicon()
+    vocabulary = np.array(sorted(lexicon), dtype="<U4")
+    if not games:
+        return {"games": 0, "models": {}, "lexicon_size": len(vocabulary), "idioms_played": 0, "unknown_idioms": []}
+
+    # Accepted idioms (the start counts as turn 0 of its game)
+    played_game, played_turn, played_idiom = [], [], []
+    # Raw model replies, with the idiom they had to follow
+    reply_game, reply_turn, reply_model, reply_text, reply_previous = [], [], [], [], []
+    # Lost games: loser model and the idiom the loser had to follow
+    lost_game, lost_model, lost_previous = [], [], []
+
+    for game_index, game in enumerate(games):
+        models = {1: game["player_1"], 2: game["player_2"]}
+        previous = game["start"]
+        played_game.append(game_index)
+        played_turn.append(0)
+        played_idiom.append(previous)
+        for turn, move in enumerate(game["moves"], 1):
+            for model, reply in move.get("replies", []):
+                reply_game.append(game_index)
+                reply_turn.append(turn)
+                reply_model.append(model)
+                reply_text.append(reply)
+                reply_previous.append(previous)
+            is_last = turn == len(game["moves"])
+            if move.get("idiom") and not (is_last and game.get("loser")):
+                played_game.append(game_index)
+                played_turn.append(turn)
+                played_idiom.append(move["idiom"])
+                previous = move["idiom"]
+        if game.get("loser"):
+            lost_game.append(game_index)
+            lost_model.append(models[game["loser"]])
+            lost_previous.append(previous)
+
+    model_names = np.array(sorted({game[f"player_{p}"] for game in games for p in (1, 2)} | set(reply_model)))
+    reply_game = np.array(reply_game, dtype=np.int64)
+    reply_turn = np.array(reply_turn, dtype=np.int64)
+    reply_model_code = _codes(reply_model, model_names)
+    texts = np.array(reply_text, dtype=object)
+    four = np.array([is_four_hanzi(text) for text in reply_text], dtype=bool)
+    reply_code = _codes(np.where(four, texts, "").astype("<U4"), vocabulary)
+    known = reply_code >= 0
+
+    # Chain keys, prefixed with the game's mode: a reply chains exactly when
+    # its first key equals the last key of the idiom it had to follow. Keys
+    # use the reading a character has in its own idiom, so each is a few dict
+    # lookups; np.unique then turns them into comparable integer ids.
+    table = default_pinyin_table()
+    modes = [game.get("chain_mode", "exact") for game in games]
+    key_lists = [
+        [f"{mode}:{table.first_key(idiom, mode)}" for mode in CHAIN_MODES for idiom in vocabulary],
+        [f"{modes[g]}:{table.first_key(text, modes[g])}" for g, text in zip(reply_game, reply_text)],
+        [f"{modes[g]}:{table.last_key(previous, modes[g])}" for g, previous in zip(reply_game, reply_previous)],
+        [f"{modes[g]}:{table.first_key(idiom, modes[g])}" for g, idiom in zip(played_game, played_idiom)],
+        [f"{modes[g]}:{table.last_key(previous, modes[g])}" for g, previous in zip(lost_game, lost_previous)],
+    ]
+    key_names, key_ids = np.unique([key for keys in key_lists for key in keys], return_inverse=True)
+    lexicon_first, reply_first, reply_required, played_first, lost_key = np.split(
+        key_ids.reshape(-1), np.cumsum([len(keys) for keys in key_lists])[:-1])
+    chained = reply_first == reply_required
+
+    played_game = np.array(played_game, dtype=np.int64)
+    played_turn = np.array(played_turn, dtype=np.int64)
+    played_code = _codes(played_idiom, vocabulary)
+
+    # Repeats: a reply whose (game, idiom) key was accepted on an earlier turn
+    size = len(vocabulary) + 1
+    played_keys = played_game * size + played_code + 1
+    unique_keys, first_index = np.unique(played_keys, return_index=True)
+    reply_keys = reply_game * size + reply_code + 1
+    slot = np.minimum(np.searchsorted(unique_keys, reply_keys), len(unique_keys) - 1)
+    earlier = (unique_keys[slot] == reply_keys) & (played_turn[first_index[slot]] < reply_turn)
+    repeated = known & chained & earlier
+
+    # Dead ends: the loser's required key had no unused lexicon idiom left
+    out_degree = np.bincount(lexicon_first, minlength=len(key_names))
+    in_lexicon = played_code >= 0
+    used_keys = (played_game * len(key_names) + played_first)[in_lexicon]
+    used_unique, used_counts = np.unique(np.append(used_keys, -1), return_counts=True)
+    lost_game = np.array(lost_game, dtype=np.int64)
+    lost_keys = lost_game * len(key_names) + lost_key
+    slot = np.minimum(np.searchsorted(used_unique, lost_keys), len(used_unique) - 1)
+    used_before = np.where(used_unique[slot] == lost_keys, used_counts[slot], 0)
+    dead_end = out_degree[lost_key] - used_before <= 0
+    lost_model_code = _codes(lost_model, model_names)
+
+    counts = len(model_names)
+    replies = np.bincount(reply_model_code, minlength=counts)
+    hallucinated = np.bincount(reply_model_code[~known], minlength=counts)
+    broken_chain = np.bincount(reply_model_code[known & ~chained], minlength=counts)
+    repeats = np.bincount(reply_model_code[repeated], minlength=counts)
+    losses = np.bincount(lost_model_code, minlength=counts)
+    dead_end_losses = np.bincount(lost_model_code[dead_end], minlength=counts)
+    games_played = Counter(game[f"player_{p}"] for game in games for p in (1, 2))
+
+    unknown = Counter(texts[four & ~known])
+    return {
+        "games": len(games),
+        "models": {
+            name: {
+                "games": games_played[name],
+                "replies": int(replies[i]),
+                "hallucinations": int(hallucinated[i]),
+                "chain_violations": int(broken_chain[i]),
+                "repeats": int(repeats[i]),
+                "losses": int(losses[i]),
+                "dead_end_losses": int(dead_end_losses[i]),
+            }
+            for i, name in enumerate(model_names)
+        },
+        "lexicon_size": len(vocabulary),
+        "idioms_played": int(np.unique(played_code[in_lexicon]).size),
+        "unknown_idioms": unknown.most_common(),
+    }
+
+def print_report(report, top=10):
+    print(f"📊 {report['games']} 局对战记录")
+    for name, stats in report["models"].items():
+        replies = stats["replies"] or 1
+        print(f"🤖 {name}: {stats['games']} 局, {stats['replies']} 个回答, "
+              f"幻觉率 {stats['hallucinations'] / replies:.1%}, 断链率 {stats['chain_violations'] / replies:.1%}, "
+              f"重复率 {stats['repeats'] / replies:.1%}, 负 {stats['losses']} 局 (死局 {stats['dead_end_losses']} 局)")
+    coverage = report["idioms_played"] / report["lexicon_size"] if report["lexicon_size"] else 0
+    print(f"词典覆盖: 用到 {report['idioms_played']}/{report['lexicon_size']} 个成语 ({coverage:.1%})")
+    if report["unknown_idioms"]:
+        print("词典中没有的四字回答 (可考虑加入 idioms.txt):")
+        for idiom, count in report["unknown_idioms"][:top]:
+            print(f"   {idiom}: {count}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate recorded idiom-chain games in bulk and report per-model error rates.")
+    parser.add_argument("logs", nargs="*", default=[DEFAULT_LOG_PATH], help="JSONL game logs (default: game_logs.jsonl)")
+    parser.add_argument("--top", type=int, default=10, help="Unknown idioms to list")
+    parser.add_argument("--output", help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    start = time.time()
+    games = load_game_logs(args.logs)
+    report = analyze_game_logs(games)
+    print_report(report, args.top)
+    print(f"分析用时 {time.time() - start:.2f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
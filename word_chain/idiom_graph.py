@@ -0,0 +1,279 @@
+import os
+import time
+import struct
+import random
+import argparse
+
+from idiom_lexicon import DEFAULT_LEXICON_PATH, default_lexicon
+
+# Precomputed graph statistics, rebuilt whenever idioms.txt is newer.
+DEFAULT_GRAPH_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "idiom_graph.bin")
+
+# Predicted outcome for the player who must play an idiom starting with a
+# character, assuming both sides play perfectly and ignoring used idioms.
+OPEN, WIN, LOSS = 0, 1, 2
+
+# File layout: header, then one record per character sorted by code point.
+#   header: magic, character count
+#   record: code point, out-degree, in-degree, reachable characters,
+#           reachable idioms, predicted outcome
+GRAPH_MAGIC = b"IDIOMGR1"
+GRAPH_HEADER = struct.Struct("<8sI")
+CHAR_RECORD = struct.Struct("<IHHIIB")
+
+def build_graph(idioms):
+    """
+    Build the character transition graph: every idiom is an edge from its
+    first character to its last one, so an idiom is followed by the idioms
+    that start at the node its edge points to
+
+    Returns:
+        (successors, predecessors): dicts from character to the list of
+        edge targets / sources, one entry per idiom
+    """
+    successors, predecessors = {}, {}
+    for idiom in idioms:
+        first, last = idiom[0], idiom[-1]
+        successors.setdefault(first, []).append(last)
+        predecessors.setdefault(last, []).append(first)
+        successors.setdefault(last, [])
+        predecessors.setdefault(first, [])
+    return successors, predecessors
+
+def strongly_connected_components(successors):
+    """Iterative Tarjan; returns components in reverse topological order (sinks first)"""
+    index, low, on_stack = {}, {}, set()
+    stack, components = [], []
+    counter = 0
+    for root in successors:
+        if root in index:
+            continue
+        work = [(root, iter(successors[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+def reachable_sizes(successors):
+    """
+    For every character, count the characters and idioms reachable from it
+    (itself included), using bitsets over the condensation DAG
+
+    Returns:
+        dict: character -> (reachable characters, reachable idioms)
+    """
+    components = strongly_connected_components(successors)
+    component_of = {}
+    for number, component in enumerate(components):
+        for char in component:
+            component_of[char] = number
+
+    # Components come sinks first, so successors are finished before use.
+    reach = []
+    for number, component in enumerate(components):
+        bits = 1 << number
+        for char in component:
+            for target in successors[char]:
+                bits |= reach[component_of[target]] if component_of[target] != number else 0
+        reach.append(bits)
+
+    sizes = [len(component) for component in components]
+    idiom_counts = [sum(len(successors[char]) for char in component) for component in components]
+    result = {}
+    for number, component in enumerate(components):
+        bits, chars, idioms = reach[number], 0, 0
+        while bits:
+            low_bit = bits & -bits
+            reached = low_bit.bit_length() - 1
+            chars += sizes[reached]
+            idioms += idiom_counts[reached]
+            bits ^= low_bit
+        for char in component:
+            result[char] = (chars, idioms)
+    return result
+
+def solve_outcomes(successors, predecessors):
+    """
+    Retrograde analysis of the character graph: a character with no idioms
+    is a loss for the player to move, one with an idiom leading to a loss is
+    a win, and one whose idioms all lead to wins is a loss. Characters never
+    resolved stay OPEN
+    """
+    outcome = {char: OPEN for char in successors}
+    remaining = {char: len(targets) for char, targets in successors.items()}
+    queue = [char for char, count in remaining.items() if count == 0]
+    for char in queue:
+        outcome[char] = LOSS
+    while queue:
+        char = queue.pop()
+        for source in predecessors[char]:
+            if outcome[source] != OPEN:
+                continue
+            if outcome[char] == LOSS:
+                outcome[source] = WIN
+                queue.append(source)
+            else:
+                remaining[source] -= 1
+                if remaining[source] == 0:
+                    outcome[source] = LOSS
+                    queue.append(source)
+    return outcome
+
+def analyze_lexicon(idioms):
+    """
+    Returns:
+        dict: character -> {"out_degree", "in_degree", "reachable_chars",
+        "reachable_idioms", "outcome"}
+    """
+    successors, predecessors = build_graph(idioms)
+    sizes = reachable_sizes(successors)
+    outcomes = solve_outcomes(successors, predecessors)
+    return {
+        char: {
+            "out_degree": len(successors[char]),
+            "in_degree": len(predecessors[char]),
+            "reachable_chars": sizes[char][0],
+            "reachable_idioms": sizes[char][1],
+            "outcome": outcomes[char],
+        }
+        for char in successors
+    }
+
+def write_graph_stats(stats, path=DEFAULT_GRAPH_PATH):
+    # Write to a temporary file and swap it in, so a concurrent reader never sees a partial file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(GRAPH_HEADER.pack(GRAPH_MAGIC, len(stats)))
+            for char in sorted(stats):
+                s = stats[char]
+                f.write(CHAR_RECORD.pack(ord(char), min(s["out_degree"], 0xFFFF), min(s["in_degree"], 0xFFFF),
+                                         s["reachable_chars"], s["reachable_idioms"], s["outcome"]))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def read_graph_stats(path=DEFAULT_GRAPH_PATH):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, count = GRAPH_HEADER.unpack_from(data, 0)
+    if magic != GRAPH_MAGIC:
+        raise ValueError(f"{path} is not an idiom graph file.")
+    stats = {}
+    for i in range(count):
+        code, out_degree, in_degree, chars, idioms, outcome = CHAR_RECORD.unpack_from(
+            data, GRAPH_HEADER.size + i * CHAR_RECORD.size)
+        stats[chr(code)] = {"out_degree": out_degree, "in_degree": in_degree,
+                            "reachable_chars": chars, "reachable_idioms": idioms, "outcome": outcome}
+    return stats
+
+_graph_stats = None
+
+def graph_stats():
+    """Return the per-character statistics, building the graph file when missing or stale"""
+    global _graph_stats
+    if _graph_stats is None:
+        if (os.path.exists(DEFAULT_GRAPH_PATH)
+                and os.path.getmtime(DEFAULT_GRAPH_PATH) >= os.path.getmtime(DEFAULT_LEXICON_PATH)):
+            try:
+                _graph_stats = read_graph_stats(DEFAULT_GRAPH_PATH)
+            except (OSError, ValueError, struct.error):
+                pass  # Unreadable or corrupt: rebuild it below
+        if _graph_stats is None:
+            _graph_stats = analyze_lexicon(default_lexicon())
+            try:
+                write_graph_stats(_graph_stats, DEFAULT_GRAPH_PATH)
+            except OSError:
+                pass
+    return _graph_stats
+
+def pick_starting_idiom(rng=random, top=30, lexicon=None, stats=None):
+    """
+    Pick a random idiom among the top idioms ranked by their last character:
+    undecided characters first, then by reachable idioms and out-degree, so
+    games tend to run long
+    """
+    lexicon = default_lexicon() if lexicon is None else lexicon
+    stats = graph_stats() if stats is None else stats
+    def potential(idiom):
+        s = stats.get(idiom[-1])
+        if s is None:
+            return (False, 0, 0)
+        return (s["outcome"] == OPEN, s["reachable_idioms"], s["out_degree"])
+    ranked = sorted(lexicon, key=potential, reverse=True)
+    return rng.choice(ranked[:top])
+
+def predict_outcome(char, used=(), lexicon=None):
+    """
+    Predict WIN, LOSS or OPEN for the player who must play an idiom starting
+    with char. With used idioms the analysis is rerun on the idioms still
+    available, which takes milliseconds for the bundled lexicon
+    """
+    if not used:
+        s = graph_stats().get(char)
+        return LOSS if s is None else s["outcome"]
+    lexicon = default_lexicon() if lexicon is None else lexicon
+    used = set(used)
+    successors, predecessors = build_graph(idiom for idiom in lexicon if idiom not in used)
+    if char not in successors:
+        return LOSS
+    return solve_outcomes(successors, predecessors)[char]
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze the idiom transition graph and store per-character statistics.")
+    parser.add_argument("--output", default=DEFAULT_GRAPH_PATH, help="Graph statistics file to write")
+    parser.add_argument("--show", type=int, default=10, help="Characters to list per category")
+    args = parser.parse_args()
+
+    start = time.time()
+    lexicon = default_lexicon()
+    stats = analyze_lexicon(lexicon)
+    write_graph_stats(stats, args.output)
+    elapsed = time.time() - start
+
+    traps = sorted((c for c, s in stats.items() if s["out_degree"] == 0), key=lambda c: -stats[c]["in_degree"])
+    wins = [c for c, s in stats.items() if s["outcome"] == WIN]
+    losses = [c for c, s in stats.items() if s["outcome"] == LOSS]
+    hubs = sorted(stats, key=lambda c: -stats[c]["out_degree"])
+    largest = max(s["reachable_idioms"] for s in stats.values())
+    print(f"{len(lexicon)} 个成语, {len(stats)} 个字, 分析用时 {elapsed:.2f}s, 结果写入 {args.output}")
+    print(f"死局字 (没有成语以它开头): {len(traps)}, 例如 {' '.join(traps[:args.show])}")
+    print(f"必胜字: {len(wins)}, 必败字: {len(losses)}")
+    hub_list = " ".join(f"{c}({stats[c]['out_degree']})" for c in hubs[:args.show])
+    print(f"出度最高的字: {hub_list}")
+    print(f"单个字最多可达 {largest} 个成语")
+
+if __name__ == "__main__":
+    main()
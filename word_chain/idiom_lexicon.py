@@ -0,0 +1,186 @@
+import os
+import mmap
+import struct
+import argparse
+
+# Bundled list of common four-character idioms, one per line (UTF-8).
+# Replace or extend it with a larger list to accept more idioms.
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "idioms.txt")
+# Prebuilt binary form of the same list, rebuilt whenever idioms.txt is newer.
+DEFAULT_BINARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "idioms.bin")
+
+# Binary layout: header, idiom records, first-character table.
+#   header: magic, idiom count, first-character table entry count
+#   idiom record: four characters as UTF-32-BE (16 bytes), sorted, so byte
+#                 order equals code point order and binary search works on
+#                 the raw bytes
+#   table entry: first character code point, index of its first idiom, count
+LEXICON_MAGIC = b"IDIOMLX1"
+BINARY_HEADER = struct.Struct("<8sII")
+IDIOM_RECORD_SIZE = 16
+CHAR_ENTRY = struct.Struct("<III")
+
+def is_four_hanzi(text):
+    """Check that text is exactly four CJK characters"""
+    return len(text) == 4 and all('\u4e00' <= char <= '\u9fff' for char in text)
+
+class IdiomLexicon:
+    """
+    In-memory idiom dictionary.
+
+    Membership is a set lookup and candidates for a required first character
+    come from an index keyed by first character, so neither needs an LLM call.
+    """
+
+    def __init__(self, idioms=()):
+        self.idioms = set()
+        self.by_first_char = {}
+        for idiom in idioms:
+            self.add(idiom)
+
+    @classmethod
+    def load(cls, path=DEFAULT_LEXICON_PATH):
+        """Load a lexicon from a text file with one idiom per line"""
+        with open(path, encoding="utf-8") as f:
+            return cls(line.strip() for line in f if is_four_hanzi(line.strip()))
+
+    def add(self, idiom):
+        if idiom not in self.idioms:
+            self.idioms.add(idiom)
+            self.by_first_char.setdefault(idiom[0], []).append(idiom)
+
+    def __contains__(self, idiom):
+        return idiom in self.idioms
+
+    def __len__(self):
+        return len(self.idioms)
+
+    def starting_with(self, char):
+        """Return all idioms whose first character is char"""
+        return self.by_first_char.get(char, [])
+
+    def __iter__(self):
+        return iter(sorted(self.idioms))
+
+def write_binary_lexicon(idioms, path=DEFAULT_BINARY_PATH):
+    """Write idioms in the memory-mappable binary format"""
+    idioms = sorted(set(idioms))
+    table = []
+    for index, idiom in enumerate(idioms):
+        if not table or table[-1][0] != ord(idiom[0]):
+            table.append([ord(idiom[0]), index, 0])
+        table[-1][2] += 1
+    # Write to a temporary file and swap it in, so a concurrent reader never maps a partial file
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(BINARY_HEADER.pack(LEXICON_MAGIC, len(idioms), len(table)))
+            for idiom in idioms:
+                f.write(idiom.encode("utf-32-be"))
+            for entry in table:
+                f.write(CHAR_ENTRY.pack(*entry))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return len(idioms)
+
+class MappedIdiomLexicon:
+    """
+    Read-only idiom dictionary backed by a memory-mapped binary file.
+
+    Opening it parses nothing, and every process that maps the file shares
+    its pages. Membership and first-character lookups are binary searches
+    over the sorted fixed-width records.
+    """
+
+    def __init__(self, path=DEFAULT_BINARY_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.char_count = BINARY_HEADER.unpack_from(self._mmap, 0)
+        if magic != LEXICON_MAGIC:
+            raise ValueError(f"{path} is not a binary idiom lexicon.")
+        self._table_offset = BINARY_HEADER.size + self.count * IDIOM_RECORD_SIZE
+
+    def _record(self, index):
+        start = BINARY_HEADER.size + index * IDIOM_RECORD_SIZE
+        return self._mmap[start:start + IDIOM_RECORD_SIZE]
+
+    def __contains__(self, idiom):
+        if not is_four_hanzi(idiom):
+            return False
+        key = idiom.encode("utf-32-be")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._record(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self.count and self._record(low) == key
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self._record(index).decode("utf-32-be")
+
+    def starting_with(self, char):
+        """Return all idioms whose first character is char"""
+        code = ord(char)
+        low, high = 0, self.char_count
+        while low < high:
+            middle = (low + high) // 2
+            entry_code, start, count = CHAR_ENTRY.unpack_from(self._mmap, self._table_offset + middle * CHAR_ENTRY.size)
+            if entry_code == code:
+                data = self._mmap[BINARY_HEADER.size + start * IDIOM_RECORD_SIZE:
+                                  BINARY_HEADER.size + (start + count) * IDIOM_RECORD_SIZE]
+                text = data.decode("utf-32-be")
+                return [text[i:i + 4] for i in range(0, len(text), 4)]
+            if entry_code < code:
+                low = middle + 1
+            else:
+                high = middle
+        return []
+
+    def close(self):
+        self._mmap.close()
+
+_default_lexicon = None
+
+def default_lexicon():
+    """
+    Return the bundled lexicon, loading it on first use.
+    The memory-mapped binary form is used, and (re)built from idioms.txt
+    when it is missing or older than the text list.
+    """
+    global _default_lexicon
+    if _default_lexicon is None:
+        try:
+            if (not os.path.exists(DEFAULT_BINARY_PATH)
+                    or os.path.getmtime(DEFAULT_BINARY_PATH) < os.path.getmtime(DEFAULT_LEXICON_PATH)):
+                write_binary_lexicon(IdiomLexicon.load(DEFAULT_LEXICON_PATH).idioms, DEFAULT_BINARY_PATH)
+            _default_lexicon = MappedIdiomLexicon(DEFAULT_BINARY_PATH)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"无法使用二进制成语词典, 改用文本词典: {e}")
+            _default_lexicon = IdiomLexicon.load(DEFAULT_LEXICON_PATH)
+    return _default_lexicon
+
+def is_known_idiom(idiom):
+    """Check whether idiom is in the bundled lexicon"""
+    return idiom in default_lexicon()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped binary idiom lexicon from a text list.")
+    parser.add_argument("source", nargs="?", default=DEFAULT_LEXICON_PATH, help="Text file with one idiom per line")
+    parser.add_argument("--output", default=DEFAULT_BINARY_PATH, help="Binary lexicon file to write")
+    args = parser.parse_args()
+
+    count = write_binary_lexicon(IdiomLexicon.load(args.source).idioms, args.output)
+    print(f"Wrote {count} idioms to {args.output} ({os.path.getsize(args.output)} bytes)")
+
+if __name__ == "__main__":
+    main()
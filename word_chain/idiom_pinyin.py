@@ -0,0 +1,201 @@
+import os
+import argparse
+from collections import Counter
+
+from idiom_lexicon import DEFAULT_LEXICON_PATH, IdiomLexicon, default_lexicon
+
+# Bundled pinyin table: one "字 pin1" line per character of idioms.txt, then a
+# "成语 first last" line for each idiom whose first or last character is read
+# differently there than its default (重 is chong2 in 重蹈覆辙 but zhong4 in 举足轻重).
+# Tones are written as a trailing digit (5 for the neutral tone).
+DEFAULT_PINYIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pinyin.txt")
+
+# How the first character of an idiom must match the last character of the previous one:
+#   "exact":     the same character (standard 成语接龙)
+#   "homophone": the same syllable and tone (同音接龙)
+#   "pinyin":    the same syllable, any tone
+CHAIN_MODES = ("exact", "homophone", "pinyin")
+DEFAULT_CHAIN_MODE = "exact"
+
+def _reading_key(reading, char, mode):
+    if mode == "exact" or reading is None:
+        return char
+    return reading if mode == "homophone" else reading.rstrip("012345")
+
+class PinyinTable:
+    """
+    Precomputed pinyin lookup.
+
+    Every character has a default reading, the one it most often takes at
+    the start or end of the bundled idioms (in citation tone). Idioms where
+    a polyphonic first or last character is read otherwise carry their own
+    edge readings, so it chains by the sound it actually has there. Either
+    way matching two idioms is a few dict lookups.
+    """
+
+    def __init__(self, readings=None, idiom_readings=None):
+        self.readings = dict(readings or {})
+        self.idiom_readings = dict(idiom_readings or {})
+
+    @classmethod
+    def load(cls, path=DEFAULT_PINYIN_PATH):
+        readings, idiom_readings = {}, {}
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2:
+                    readings[parts[0]] = parts[1]
+                elif len(parts) == 3:
+                    idiom_readings[parts[0]] = (parts[1], parts[2])
+        return cls(readings, idiom_readings)
+
+    def reading(self, char):
+        """Return the toned pinyin of char (e.g. "yi1"), or None if unknown"""
+        return self.readings.get(char)
+
+    def edge_readings(self, idiom):
+        """Return the toned pinyin of the first and last characters of idiom (None if unknown)"""
+        readings = self.idiom_readings.get(idiom)
+        if readings is None:
+            return self.readings.get(idiom[:1]), self.readings.get(idiom[-1:])
+        return readings
+
+    def chain_key(self, char, mode=DEFAULT_CHAIN_MODE):
+        """
+        Return the key of a lone character under mode, by its default reading.
+        Characters missing from the table only match themselves.
+        """
+        return _reading_key(self.readings.get(char), char, mode)
+
+    def first_key(self, idiom, mode=DEFAULT_CHAIN_MODE):
+        """Return the key the first character of idiom must share with the previous idiom's last"""
+        if mode == "exact":
+            return idiom[:1]
+        return _reading_key(self.edge_readings(idiom)[0], idiom[:1], mode)
+
+    def last_key(self, idiom, mode=DEFAULT_CHAIN_MODE):
+        """Return the key the next idiom's first character must match under mode"""
+        if mode == "exact":
+            return idiom[-1:]
+        return _reading_key(self.edge_readings(idiom)[1], idiom[-1:], mode)
+
+    def write(self, path=DEFAULT_PINYIN_PATH):
+        with open(path, "w", encoding="utf-8") as f:
+            for char in sorted(self.readings):
+                f.write(f"{char} {self.readings[char]}\n")
+            for idiom in sorted(self.idiom_readings):
+                first, last = self.idiom_readings[idiom]
+                f.write(f"{idiom} {first} {last}\n")
+
+class PinyinIdiomIndex:
+    """
+    Idioms grouped by the chain key of their first character, so the
+    candidates that may follow an idiom under a chain mode are one lookup.
+    """
+
+    def __init__(self, lexicon, table, mode=DEFAULT_CHAIN_MODE):
+        if mode not in CHAIN_MODES:
+            raise ValueError(f"Unknown chain mode: {mode}. Choose from {CHAIN_MODES}.")
+        self.table = table
+        self.mode = mode
+        self.by_key = {}
+        for idiom in lexicon:
+            self.by_key.setdefault(table.first_key(idiom, mode), []).append(idiom)
+
+    def following(self, idiom):
+        """Return all idioms that may follow idiom"""
+        return self.by_key.get(self.table.last_key(idiom, self.mode), [])
+
+    def links(self, previous_idiom, current_idiom):
+        """Check whether current_idiom may follow previous_idiom"""
+        return self.table.last_key(previous_idiom, self.mode) == self.table.first_key(current_idiom, self.mode)
+
+# Characters whose tone only changes by tone sandhi (一 is yi2 in 一事无成 and
+# yi4 in 一刀两断). They always use their citation tone, so homophone
+# chaining on them does not depend on the following syllable.
+SANDHI_CITATION = {"一": "yi1", "不": "bu4", "七": "qi1", "八": "ba1"}
+
+def _citation(char, reading):
+    citation = SANDHI_CITATION.get(char)
+    if citation is not None and reading.rstrip("012345") == citation.rstrip("012345"):
+        return citation
+    return reading
+
+def build_pinyin_table(idioms):
+    """
+    Build the table from a list of idioms with pypinyin (only needed to
+    regenerate pinyin.txt, not to play). Each idiom is converted as a phrase,
+    so polyphonic characters get the reading they take in context. Idioms
+    only get their own edge readings where these differ from the
+    characters' default readings (real polyphones such as 重 or 行); tone
+    sandhi is undone first, see SANDHI_CITATION.
+    """
+    try:
+        from pypinyin import Style, lazy_pinyin
+    except ImportError:
+        raise ImportError("Building the pinyin table requires pypinyin: pip install pypinyin")
+
+    edge_counts, any_counts, edges = {}, {}, {}
+    for idiom in idioms:
+        readings = lazy_pinyin(idiom, style=Style.TONE3, neutral_tone_with_five=True)
+        if len(readings) != len(idiom):
+            continue
+        readings = [_citation(char, reading) for char, reading in zip(idiom, readings)]
+        edges[idiom] = (readings[0], readings[-1])
+        for position, (char, reading) in enumerate(zip(idiom, readings)):
+            any_counts.setdefault(char, Counter())[reading] += 1
+            if position in (0, len(idiom) - 1):
+                edge_counts.setdefault(char, Counter())[reading] += 1
+    readings = {
+        char: (edge_counts.get(char) or counts).most_common(1)[0][0]
+        for char, counts in any_counts.items()
+    }
+    idiom_readings = {}
+    for idiom, (first, last) in edges.items():
+        # A neutral tone at the edge of an idiom is phrase-final weakening, not another reading
+        first = readings[idiom[0]] if first.endswith("5") else first
+        last = readings[idiom[-1]] if last.endswith("5") else last
+        if first != readings[idiom[0]] or last != readings[idiom[-1]]:
+            idiom_readings[idiom] = (first, last)
+    return PinyinTable(readings, idiom_readings)
+
+_default_table = None
+_indexes = {}
+
+def default_pinyin_table():
+    """Return the bundled pinyin table, loading it on first use"""
+    global _default_table
+    if _default_table is None:
+        _default_table = PinyinTable.load(DEFAULT_PINYIN_PATH)
+    return _default_table
+
+def default_index(mode=DEFAULT_CHAIN_MODE):
+    """Return the index of the bundled lexicon for mode, building it on first use"""
+    if mode not in _indexes:
+        _indexes[mode] = PinyinIdiomIndex(default_lexicon(), default_pinyin_table(), mode)
+    return _indexes[mode]
+
+def describe_chain_rule(idiom, mode=DEFAULT_CHAIN_MODE):
+    """Return the Chinese hint for the characters the idiom after idiom may start with"""
+    char = idiom[-1]
+    if mode == "exact":
+        return f"'{char}'"
+    reading = default_pinyin_table().edge_readings(idiom)[1]
+    if reading is None:
+        return f"'{char}'"
+    if mode == "homophone":
+        return f"与 '{char}' 同音 ({reading}) 的字"
+    return f"拼音为 {reading.rstrip('012345')} 的字 (声调不限)"
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the bundled character-to-pinyin table (requires pypinyin).")
+    parser.add_argument("source", nargs="?", default=DEFAULT_LEXICON_PATH, help="Text file with one idiom per line")
+    parser.add_argument("--output", default=DEFAULT_PINYIN_PATH, help="Pinyin table to write")
+    args = parser.parse_args()
+
+    table = build_pinyin_table(IdiomLexicon.load(args.source))
+    table.write(args.output)
+    print(f"Wrote pinyin for {len(table.readings)} characters and {len(table.idiom_readings)} idioms to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from idiom_lexicon import default_lexicon
+from idiom_pinyin import DEFAULT_CHAIN_MODE, PinyinIdiomIndex, default_index, default_pinyin_table
+
+# Model name that selects the local player in PLAYER_MODELS.
+LOCAL_MODEL = "local"
+
+def _following(lexicon, idiom):
+    """Return the idioms that may follow idiom (lexicon may be a PinyinIdiomIndex)"""
+    if isinstance(lexicon, PinyinIdiomIndex):
+        return lexicon.following(idiom)
+    return lexicon.starting_with(idiom[-1])
+
+def count_continuations(idiom, used, lexicon):
+    """Count the unused idioms that may follow idiom"""
+    return sum(1 for candidate in _following(lexicon, idiom) if candidate not in used)
+
+def get_local_idiom(game_history, current_idiom, lexicon=None, chain_mode=DEFAULT_CHAIN_MODE):
+    """
+    Pick the next idiom from the lexicon without any network call
+
+    Among the unused idioms starting with the last character of
+    current_idiom, choose the one that leaves the opponent the fewest
+    continuations (ties broken by lexicon order, so play is deterministic).
+    In the homophone chain modes candidates come from the pinyin-keyed index.
+
+    Returns:
+        String: the chosen idiom, or None if there is no valid continuation
+    """
+    if chain_mode != "exact":
+        table = default_pinyin_table()
+        lexicon = default_index(chain_mode) if lexicon is None else PinyinIdiomIndex(lexicon, table, chain_mode)
+        links_to_itself = lambda idiom: table.first_key(idiom, chain_mode) == table.last_key(idiom, chain_mode)
+    else:
+        lexicon = default_lexicon() if lexicon is None else lexicon
+        links_to_itself = lambda idiom: idiom[0] == idiom[-1]
+    used = set(game_history)
+    best, best_count = None, None
+    for idiom in _following(lexicon, current_idiom):
+        if idiom in used:
+            continue
+        # The idiom itself is used once played, so it cannot be its own reply
+        replies = count_continuations(idiom, used, lexicon) - links_to_itself(idiom)
+        if best is None or replies < best_count:
+            best, best_count = idiom, replies
+            if replies == 0:
+                break
+    return best
@@ -1,28 +1,46 @@
 import time
 import sys
-from ai_player import get_ai_idiom, initialize_client_manually, validate_idiom_chain
+from ai_player import get_ai_idiom, initialize_client_manually, print_latency_summary, validate_idiom_chain
+from local_player import LOCAL_MODEL
+from idiom_pinyin import describe_chain_rule
+from idiom_graph import LOSS, WIN, pick_starting_idiom, predict_outcome
+from idiom_game_log import append_game_log
 
 MAX_ROUNDS = 100
+STREAM_REPLIES = True  # Stream AI replies and stop reading once the idiom has arrived
+CHAIN_MODE = "exact"  # "homophone" for 同音接龙 (same pinyin and tone), "pinyin" to ignore tones
+# Use LOCAL_MODEL for either player to play the local idiom engine.
 PLAYER_MODELS = {
     1: "gpt-4o",
     2: "gpt-4o-mini"
 }
+# Optional second model raced against a slow turn, e.g. {1: "gpt-4o-mini"}; see HEDGE_DELAY in ai_player
+HEDGE_MODELS = {1: None, 2: None}
 
 class AIIdiomChainGame:
     def __init__(self, max_rounds=MAX_ROUNDS):
         self.game_history = []
+        self.used_idioms = set()
         self.current_idiom = ""
         self.round_count = 0
         self.max_rounds = max_rounds
         self.scores = {1: 0, 2: 0}
         self.player_names = {1: "GPT-4o", 2: "GPT-4o-mini"}
+        # Per-turn log of accepted idioms and raw replies, see idiom_game_log.py
+        self.moves = []
+        self.result = None
+        self.loser = None
+        self.started_at = time.time()
         
     def display_game_state(self):
         """Display current game state"""
         print("\n" + "="*70)
         print(f"🤖 AI vs AI 成语接龙对战 - 第 {self.round_count + 1}/{self.max_rounds} 轮")
         print(f"📊 分数 - {self.player_names[1]}: {self.scores[1]} | {self.player_names[2]}: {self.scores[2]}")
-        print("📜 规则: 成语的最后一个字必须与下一个成语的第一个字相同")
+        if CHAIN_MODE == "exact":
+            print("📜 规则: 成语的最后一个字必须与下一个成语的第一个字相同")
+        else:
+            print(f"📜 规则: 下一个成语的第一个字必须与成语的最后一个字读音相同{'(声调不限)' if CHAIN_MODE == 'pinyin' else ''}")
         print("="*70)
         
         if self.game_history:
@@ -32,7 +50,13 @@ class AIIdiomChainGame:
         
         if self.current_idiom:
             print(f"🎯 当前成语: {self.current_idiom}")
-            print(f"💡 提示: 下一个成语必须以 '{self.current_idiom[-1]}' 开头")
+            print(f"💡 提示: 下一个成语必须以 {describe_chain_rule(self.current_idiom, CHAIN_MODE)} 开头")
+            # The transition graph follows exact character matches only
+            outcome = predict_outcome(self.current_idiom[-1], self.game_history) if CHAIN_MODE == "exact" else None
+            if outcome == LOSS:
+                print("🔮 预测: 轮到的一方已陷入必败局面")
+            elif outcome == WIN:
+                print("🔮 预测: 轮到的一方有必胜接法")
         print()
     
     def setup_game(self):
@@ -40,17 +64,19 @@ class AIIdiomChainGame:
         print("🤖 AI vs AI 成语接龙对战! 🤖")
         print("🔹 游戏规则:")
         print("  - 每个成语必须是四个汉字")
-        print("  - 成语的第一个字必须与上一个成语的最后一个字相同")
+        if CHAIN_MODE == "exact":
+            print("  - 成语的第一个字必须与上一个成语的最后一个字相同")
+        else:
+            print(f"  - 同音接龙: 首字与上一个成语的末字读音相同即可{'(声调不限)' if CHAIN_MODE == 'pinyin' else ''}")
         print("  - 不能重复使用已经说过的成语")
         print("  - 必须是真实存在的中文成语")
         
-        # Set starting idiom
-        starting_idioms = ["一心一意", "风调雨顺", "龙飞凤舞", "花好月圆", "春回大地"]
-        import random
-        start_idiom = random.choice(starting_idioms)
+        # Start from an idiom whose last character leads into a large part of the idiom graph
+        start_idiom = pick_starting_idiom()
         
         self.current_idiom = start_idiom
         self.game_history.append(start_idiom)
+        self.used_idioms.add(start_idiom)
         
         print(f"🎯 开始成语: {start_idiom}")
         
@@ -64,33 +90,42 @@ class AIIdiomChainGame:
         model = PLAYER_MODELS[current_player]
         
         print(f"🤖 {player_name} 正在思考...")
-        time.sleep(2)  # Simulate thinking time
+        if model != LOCAL_MODEL:
+            time.sleep(2)  # Simulate thinking time
         
-        idiom = get_ai_idiom(self.game_history, self.current_idiom, model)
+        replies = []
+        idiom = get_ai_idiom(self.game_history, self.current_idiom, model, used_idioms=self.used_idioms,
+                             hedge_model=HEDGE_MODELS.get(current_player), stream=STREAM_REPLIES, replies=replies,
+                             chain_mode=CHAIN_MODE)
+        self.moves.append({"player": current_player, "idiom": idiom, "replies": replies})
         
         if idiom is None:
             print(f"🤖 {player_name} 找不到合适的成语!")
             other_player = 2 if current_player == 1 else 1
             self.scores[other_player] += 5  # Bonus points for opponent
+            self.result, self.loser = "no_idiom", current_player
             return False
         
         # Validate AI's idiom
-        if not validate_idiom_chain(self.current_idiom, idiom):
+        if not validate_idiom_chain(self.current_idiom, idiom, CHAIN_MODE):
             print(f"🤖 {player_name} 出的成语无效: {idiom}")
             other_player = 2 if current_player == 1 else 1
             self.scores[other_player] += 5
+            self.result, self.loser = "invalid", current_player
             return False
         
         # Check for repeated idiom
-        if idiom in self.game_history:
+        if idiom in self.used_idioms:
             print(f"🤖 {player_name} 重复了成语: {idiom}")
             other_player = 2 if current_player == 1 else 1
             self.scores[other_player] += 5
+            self.result, self.loser = "repeat", current_player
             return False
         
         # Valid move
         self.current_idiom = idiom
         self.game_history.append(idiom)
+        self.used_idioms.add(idiom)
         self.scores[current_player] += 1
         print(f"🤖 {player_name} 出的成语: {idiom}")
         
@@ -134,6 +169,20 @@ class AIIdiomChainGame:
             print(f"   📈 {self.player_names[2]} 胜率: {p2_rate:.1f}%")
         
         print("\n🎮 感谢观看AI成语接龙对战! 🎮")
+    
+    def save_log(self):
+        """Append this game to the game log for idiom_game_log.py"""
+        append_game_log({
+            "player_1": PLAYER_MODELS[1],
+            "player_2": PLAYER_MODELS[2],
+            "chain_mode": CHAIN_MODE,
+            "start": self.game_history[0],
+            "moves": self.moves,
+            "result": self.result or "max_rounds",
+            "loser": self.loser,
+            "started_at": self.started_at,
+            "duration": time.time() - self.started_at,
+        })
 
 def main():
     """Main game function"""
@@ -152,7 +201,8 @@ def main():
     print("🤖 成语接龙游戏 - AI vs AI 对战 🤖")
     print("=" * 50)
     
-    if not initialize_client_manually():
+    needs_client = any(model != LOCAL_MODEL for model in PLAYER_MODELS.values())
+    if needs_client and not initialize_client_manually():
         print("无法初始化OpenAI客户端. 游戏无法开始.")
         return
     
@@ -180,6 +230,8 @@ def main():
             break
     
     game.show_final_score()
+    print_latency_summary()
+    game.save_log()
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,20 @@
 import time
 import sys
-from ai_player import get_ai_idiom, initialize_client_manually, validate_idiom_chain
+from ai_player import get_ai_idiom, initialize_client_manually, print_latency_summary, validate_idiom_chain
+from idiom_lexicon import is_known_idiom
+from local_player import LOCAL_MODEL
+from idiom_pinyin import describe_chain_rule
 
 MAX_ROUNDS = 100
-PLAYER_MODELS = {"ai": "gpt-4o"}  # AI as the opponent
+STREAM_REPLIES = True  # Stream AI replies and stop reading once the idiom has arrived
+CHAIN_MODE = "exact"  # "homophone" for 同音接龙 (same pinyin and tone), "pinyin" to ignore tones
+PLAYER_MODELS = {"ai": "gpt-4o"}  # AI as the opponent, or LOCAL_MODEL for the local idiom engine
+HEDGE_MODEL = None  # e.g. "gpt-4o-mini" to race a second request against slow AI turns
 
 class IdiomChainGame:
     def __init__(self, max_rounds=MAX_ROUNDS):
         self.game_history = []
+        self.used_idioms = set()
         self.current_idiom = ""
         self.round_count = 0
         self.max_rounds = max_rounds
@@ -18,7 +25,10 @@ class IdiomChainGame:
         print("\n" + "="*60)
         print(f"🎯 成语接龙游戏 - 第 {self.round_count + 1}/{self.max_rounds} 轮")
         print(f"📊 分数 - 人类: {self.scores['human']} | AI: {self.scores['ai']}")
-        print("📜 规则: 成语的最后一个字必须与下一个成语的第一个字相同")
+        if CHAIN_MODE == "exact":
+            print("📜 规则: 成语的最后一个字必须与下一个成语的第一个字相同")
+        else:
+            print(f"📜 规则: 下一个成语的第一个字必须与成语的最后一个字读音相同{'(声调不限)' if CHAIN_MODE == 'pinyin' else ''}")
         print("="*60)
         
         if self.game_history:
@@ -28,7 +38,7 @@ class IdiomChainGame:
         
         if self.current_idiom:
             print(f"🎯 当前成语: {self.current_idiom}")
-            print(f"💡 提示: 下一个成语必须以 '{self.current_idiom[-1]}' 开头")
+            print(f"💡 提示: 下一个成语必须以 {describe_chain_rule(self.current_idiom, CHAIN_MODE)} 开头")
         print()
     
     def setup_game(self):
@@ -36,7 +46,10 @@ class IdiomChainGame:
         print("🎮 欢迎来到成语接龙游戏! 🎮")
         print("🔹 游戏规则:")
         print("  - 每个成语必须是四个汉字")
-        print("  - 你的成语的第一个字必须与上一个成语的最后一个字相同")
+        if CHAIN_MODE == "exact":
+            print("  - 你的成语的第一个字必须与上一个成语的最后一个字相同")
+        else:
+            print(f"  - 同音接龙: 你的成语的首字与上一个成语的末字读音相同即可{'(声调不限)' if CHAIN_MODE == 'pinyin' else ''}")
         print("  - 不能重复使用已经说过的成语")
         print("  - 必须是真实存在的中文成语")
         
@@ -47,8 +60,12 @@ class IdiomChainGame:
                 
                 # Validate it's a 4-character Chinese idiom
                 if len(start_idiom) == 4 and all('\u4e00' <= char <= '\u9fff' for char in start_idiom):
+                    if not is_known_idiom(start_idiom):
+                        print("词典中没有这个成语. 请输入一个真实存在的成语.")
+                        continue
                     self.current_idiom = start_idiom
                     self.game_history.append(start_idiom)
+                    self.used_idioms.add(start_idiom)
                     break
                 else:
                     print("请输入一个四字成语(只能包含汉字).")
@@ -76,13 +93,17 @@ class IdiomChainGame:
                     print("请输入一个四字成语(只能包含汉字).")
                     continue
                 
-                if user_input in self.game_history:
+                if not is_known_idiom(user_input):
+                    print("词典中没有这个成语. 请输入一个真实存在的成语.")
+                    continue
+                
+                if user_input in self.used_idioms:
                     print("这个成语已经使用过了. 请选择另一个成语.")
                     continue
                 
                 # Validate idiom chain rule
-                if not validate_idiom_chain(self.current_idiom, user_input):
-                    print(f"成语不符合接龙规则. 你的成语必须以 '{self.current_idiom[-1]}' 开头. 请重试.")
+                if not validate_idiom_chain(self.current_idiom, user_input, CHAIN_MODE):
+                    print(f"成语不符合接龙规则. 你的成语必须以 {describe_chain_rule(self.current_idiom, CHAIN_MODE)} 开头. 请重试.")
                     continue
                 
                 return user_input
@@ -103,14 +124,18 @@ class IdiomChainGame:
             
             self.current_idiom = idiom
             self.game_history.append(idiom)
+            self.used_idioms.add(idiom)
             self.scores["human"] += 1
             print(f"✅ 你出的成语: {idiom}")
             
         else:
             print("🤖 AI正在思考...")
-            time.sleep(1)  # Simulate thinking time
+            if PLAYER_MODELS["ai"] != LOCAL_MODEL:
+                time.sleep(1)  # Simulate thinking time
             
-            idiom = get_ai_idiom(self.game_history, self.current_idiom, PLAYER_MODELS["ai"])
+            idiom = get_ai_idiom(self.game_history, self.current_idiom, PLAYER_MODELS["ai"],
+                                 used_idioms=self.used_idioms, hedge_model=HEDGE_MODEL,
+                                 stream=STREAM_REPLIES, chain_mode=CHAIN_MODE)
             
             if idiom is None:
                 print("🤖 AI找不到合适的成语. 你赢了这一轮!")
@@ -118,18 +143,19 @@ class IdiomChainGame:
                 return False
             
             # Validate AI's idiom
-            if not validate_idiom_chain(self.current_idiom, idiom):
+            if not validate_idiom_chain(self.current_idiom, idiom, CHAIN_MODE):
                 print(f"🤖 AI出的成语无效: {idiom}. 你赢了这一轮!")
                 self.scores["human"] += 5
                 return False
             
-            if idiom in self.game_history:
+            if idiom in self.used_idioms:
                 print(f"🤖 AI重复了成语: {idiom}. 你赢了这一轮!")
                 self.scores["human"] += 5
                 return False
             
             self.current_idiom = idiom
             self.game_history.append(idiom)
+            self.used_idioms.add(idiom)
             self.scores["ai"] += 1
             print(f"🤖 AI出的成语: {idiom}")
         
@@ -176,7 +202,7 @@ def main():
     print("🎯 成语接龙游戏 - 人类 vs AI 🤖")
     print("=" * 50)
     
-    if not initialize_client_manually():
+    if PLAYER_MODELS["ai"] != LOCAL_MODEL and not initialize_client_manually():
         print("无法初始化OpenAI客户端. 游戏无法开始.")
         return
     
@@ -203,6 +229,7 @@ def main():
             break
     
     game.show_final_score()
+    print_latency_summary()
 
 if __name__ == "__main__":
     main()